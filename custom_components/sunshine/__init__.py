@@ -1,6 +1,7 @@
 """The Sunshine Scooter integration."""
 from __future__ import annotations
 
+from collections.abc import Iterable
 import logging
 from typing import Any
 
@@ -8,14 +9,57 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ENTITY_ID, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.util import dt as dt_util
 
 from .api import SunshineAPI
-from .const import ATTR_DURATION, DOMAIN
+from .command_queue import SunshineCommandQueue
+from .commands import SunshineCommandTracker
+from .const import (
+    ATTR_COMPRESS,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    ATTR_DURATION,
+    ATTR_FILENAME,
+    ATTR_FORMAT,
+    ATTR_INCREMENTAL,
+    ATTR_MAX_CONCURRENT,
+    CAPTURE_FILENAME,
+    CATEGORY_FLEET,
+    CATEGORY_PLATFORMS,
+    CONF_CAPTURE_SCRUB_LOCATIONS,
+    CONF_CAPTURE_TRAFFIC,
+    COMMAND_CONNECTIONS,
+    CONF_BASE_URL,
+    CONF_ENTITY_CATEGORIES,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CORE_PLATFORMS,
+    DEFAULT_BASE_URL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+    ENTITY_CATEGORIES,
+    EXPORT_FORMAT_NDJSON,
+    EXPORT_FORMATS,
+)
 from .coordinator import SunshineDataUpdateCoordinator
+from .export import SunshineSnapshotExporter, resolve_config_path
+from .firmware import SunshineFirmwareTracker
+from .fleet import FLEET_FIELDS, SunshineFleetAggregator
+from .profiler import RefreshProfiler
+from .replay import TrafficRecorder
+from .session import async_acquire_session, async_release_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,34 +69,147 @@ PLATFORMS: list[Platform] = [
     Platform.BUTTON,
     Platform.DEVICE_TRACKER,
     Platform.SELECT,
+    Platform.UPDATE,
 ]
 
 
+def _enabled_platforms(categories: set[str]) -> list[Platform]:
+    """Return the platforms that create entities for the enabled categories."""
+    enabled = set(CORE_PLATFORMS)
+    for category in categories:
+        enabled.update(CATEGORY_PLATFORMS[category])
+    
+    return [platform for platform in PLATFORMS if platform in enabled]
+
+
+def _scooter_id_from_entity_id(hass: HomeAssistant, entity_id: str) -> str:
+    """Return the scooter ID an entity belongs to."""
+    if (entry := er.async_get(hass).async_get(entity_id)) and entry.device_id:
+        if device := dr.async_get(hass).async_get(entry.device_id):
+            for domain, identifier in device.identifiers:
+                if domain == DOMAIN:
+                    return identifier
+    
+    return entity_id.split(".")[-1].replace("_lock", "")
+
+
+def _entry_data_from_call(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    """Return the data of the config entry a service call is for."""
+    entries = hass.data.get(DOMAIN, {})
+    if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is not None:
+        if entry_id not in entries:
+            raise HomeAssistantError(f"Config entry {entry_id} is not loaded")
+        return entries[entry_id]
+    
+    if len(entries) != 1:
+        raise HomeAssistantError(
+            f"{len(entries)} Sunshine accounts are loaded, "
+            f"choose one with {ATTR_CONFIG_ENTRY_ID}"
+        )
+    return next(iter(entries.values()))
+
+
+@callback
+def _async_remove_stale_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    scooter_ids: Iterable[str],
+    unique_ids: set[str],
+) -> None:
+    """Remove registry entries of entities the enabled categories no longer create.
+    
+    Only entities of known scooters and of the entry itself are removed, so
+    a scooter missing from one refresh keeps its entities and their settings.
+    """
+    registry = er.async_get(hass)
+    owners = (f"{entry.entry_id}_", *(f"{scooter_id}_" for scooter_id in scooter_ids))
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if registry_entry.unique_id in unique_ids:
+            continue
+        if registry_entry.unique_id.startswith(owners):
+            _LOGGER.debug("Removing %s, its category is disabled", registry_entry.entity_id)
+            registry.async_remove(registry_entry.entity_id)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Sunshine from a config entry."""
     hass.data.setdefault(DOMAIN, {})
     
-    session = async_get_clientsession(hass)
+    base_url = entry.data.get(CONF_BASE_URL, DEFAULT_BASE_URL)
+    max_concurrent_requests = entry.options.get(
+        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+    )
+    
+    session = async_acquire_session(
+        hass, entry.entry_id, max_concurrent_requests + COMMAND_CONNECTIONS
+    )
     api = SunshineAPI(
         entry.data["token"], 
-        entry.data.get("base_url", "https://rescoot.org"),
-        session
+        base_url,
+        session.session,
+        max_concurrent_requests,
     )
     
+    if entry.options.get(CONF_CAPTURE_TRAFFIC, False):
+        api.recorder = TrafficRecorder(
+            hass.config.path(CAPTURE_FILENAME),
+            entry.options.get(CONF_CAPTURE_SCRUB_LOCATIONS, True),
+        )
+    
     try:
         await api.test_authentication()
     except Exception as err:
+        await async_release_session(hass, entry.entry_id)
         raise ConfigEntryAuthFailed from err
     
     coordinator = SunshineDataUpdateCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await async_release_session(hass, entry.entry_id)
+        raise
+    
+    firmware = SunshineFirmwareTracker(hass, api)
+    commands = SunshineCommandTracker(hass, api, coordinator)
+    command_queue = SunshineCommandQueue(hass, entry.entry_id, commands, coordinator)
+    await command_queue.async_load()
+    entry.async_on_unload(
+        coordinator.async_add_listener(command_queue.async_handle_coordinator_update)
+    )
+    
+    exporter = SunshineSnapshotExporter(hass, entry.entry_id, api)
+    
+    categories = set(entry.options.get(CONF_ENTITY_CATEGORIES, ENTITY_CATEGORIES))
+    platforms = _enabled_platforms(categories)
+    
+    fleet = None
+    if CATEGORY_FLEET in categories:
+        fleet = SunshineFleetAggregator(coordinator)
+        entry.async_on_unload(coordinator.async_register_fields(FLEET_FIELDS))
+        entry.async_on_unload(
+            coordinator.async_add_listener(fleet.async_handle_coordinator_update)
+        )
     
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
+        "firmware": firmware,
+        "commands": commands,
+        "command_queue": command_queue,
+        "exporter": exporter,
+        "fleet": fleet,
+        "session": session,
+        "categories": categories,
+        "platforms": platforms,
+        "unique_ids": set(),
     }
     
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    _async_remove_stale_entities(
+        hass, entry, coordinator.data, hass.data[DOMAIN][entry.entry_id]["unique_ids"]
+    )
     
     # Register services
     async def handle_trigger_alarm(call: ServiceCall) -> None:
@@ -60,8 +217,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entity_id = call.data[ATTR_ENTITY_ID][0]
         duration = call.data[ATTR_DURATION]
         
-        # Extract scooter_id from entity_id
-        scooter_id = entity_id.split(".")[-1].replace("_lock", "")
+        scooter_id = _scooter_id_from_entity_id(hass, entity_id)
         
         await api.trigger_alarm(scooter_id, duration)
         await coordinator.async_request_refresh()
@@ -70,20 +226,62 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         """Handle request telemetry service call."""
         entity_id = call.data[ATTR_ENTITY_ID][0]
         
-        # Extract scooter_id from entity_id
-        scooter_id = entity_id.split(".")[-1].replace("_lock", "")
+        scooter_id = _scooter_id_from_entity_id(hass, entity_id)
         
         await api.request_telemetry(scooter_id)
         await coordinator.async_request_refresh()
     
     async def handle_update_firmware(call: ServiceCall) -> None:
         """Handle update firmware service call."""
-        entity_id = call.data[ATTR_ENTITY_ID][0]
+        # Scooters are updated by the account their entities belong to
+        registry = er.async_get(hass)
+        rollouts: dict[str, dict[str, None]] = {}
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            registry_entry = registry.async_get(entity_id)
+            if (
+                registry_entry is None
+                or registry_entry.config_entry_id not in hass.data[DOMAIN]
+            ):
+                raise HomeAssistantError(f"{entity_id} is not a loaded Sunshine entity")
+            rollouts.setdefault(registry_entry.config_entry_id, {})[
+                _scooter_id_from_entity_id(hass, entity_id)
+            ] = None
         
-        # Extract scooter_id from entity_id
-        scooter_id = entity_id.split(".")[-1].replace("_lock", "")
+        # Updates are rolled out in order, a few scooters at a time
+        for entry_id, scooter_ids in rollouts.items():
+            hass.data[DOMAIN][entry_id]["firmware"].async_schedule(
+                scooter_ids, call.data.get(ATTR_MAX_CONCURRENT)
+            )
+    
+    async def handle_export_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Handle export snapshot service call."""
+        exporter = _entry_data_from_call(hass, call)["exporter"]
+        result = await exporter.async_export(
+            call.data[ATTR_FORMAT],
+            call.data.get(ATTR_FILENAME),
+            call.data[ATTR_COMPRESS],
+            call.data[ATTR_INCREMENTAL],
+        )
+        return {
+            "path": result.path,
+            "scooters": result.scooters,
+            "incremental": result.incremental,
+            "since": result.since,
+        }
+    
+    async def handle_profile(call: ServiceCall) -> None:
+        """Handle profile service call."""
+        coordinator = _entry_data_from_call(hass, call)["coordinator"]
+        if coordinator.profiler is not None:
+            raise HomeAssistantError("A profile is already running")
         
-        await api.update_firmware(scooter_id)
+        filename = call.data.get(ATTR_FILENAME) or (
+            f"sunshine_profile_{dt_util.utcnow().strftime('%Y%m%dT%H%M%SZ')}.txt"
+        )
+        coordinator.profiler = RefreshProfiler(
+            hass, call.data[ATTR_CYCLES], resolve_config_path(hass, filename)
+        )
+        await coordinator.async_request_refresh()
     
     hass.services.async_register(
         DOMAIN,
@@ -110,6 +308,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         handle_update_firmware,
         schema=vol.Schema({
             vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_MAX_CONCURRENT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        }),
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        "export_snapshot",
+        handle_export_snapshot,
+        schema=vol.Schema({
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_NDJSON): vol.In(EXPORT_FORMATS),
+            vol.Optional(ATTR_FILENAME): cv.string,
+            vol.Optional(ATTR_COMPRESS, default=False): cv.boolean,
+            vol.Optional(ATTR_INCREMENTAL, default=False): cv.boolean,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        handle_profile,
+        schema=vol.Schema({
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Optional(ATTR_CYCLES, default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=100)
+            ),
+            vol.Optional(ATTR_FILENAME): cv.string,
         }),
     )
     
@@ -118,19 +344,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+    platforms = hass.data[DOMAIN][entry.entry_id]["platforms"]
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, platforms):
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        if (profiler := data["coordinator"].profiler) is not None:
+            profiler.cancel()
+        await data["firmware"].async_shutdown()
+        await data["command_queue"].async_shutdown()
+        await data["commands"].async_shutdown()
+        if data["api"].recorder is not None:
+            await data["api"].recorder.async_close()
+        await async_release_session(hass, entry.entry_id)
         
         # Unregister services if this is the last config entry
         if not hass.data[DOMAIN]:
             hass.services.async_remove(DOMAIN, "trigger_alarm")
             hass.services.async_remove(DOMAIN, "request_telemetry")
             hass.services.async_remove(DOMAIN, "update_firmware")
+            hass.services.async_remove(DOMAIN, "export_snapshot")
+            hass.services.async_remove(DOMAIN, "profile")
     
     return unload_ok
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
\ No newline at end of file
+    await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
@@ -2,24 +2,150 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator, Collection
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+import heapq
+import itertools
 import logging
+import time
 from typing import Any
 
 import aiohttp
 
-from .const import DEFAULT_BASE_URL
+from .const import (
+    COMMAND_CONNECTIONS,
+    DEFAULT_BASE_URL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_LANES,
+)
+from .replay import TrafficRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class LaneStats:
+    """Queue statistics of a request priority lane."""
+    
+    requests: int = 0
+    queued: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return asdict(self)
+
+
+class RequestScheduler:
+    """Limit concurrent requests and hand out free slots by priority.
+    
+    Queued requests are started in priority order, so a command never waits
+    behind queued polling. Interactive requests may also use ``reserved``
+    extra slots that polling can never occupy.
+    """
+    
+    def __init__(self, limit: int, reserved: int = 0) -> None:
+        """Initialize the scheduler."""
+        self.limit = limit
+        self.reserved = reserved
+        self.stats = {priority: LaneStats() for priority in PRIORITY_LANES}
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+    
+    def _capacity(self, priority: int) -> int:
+        """Return how many requests may run when one of this priority starts."""
+        if priority == PRIORITY_INTERACTIVE:
+            return self.limit + self.reserved
+        return self.limit
+    
+    def _can_start(self, priority: int) -> bool:
+        """Return true if a request can start without queueing."""
+        if self._active >= self._capacity(priority):
+            return False
+        # Never overtake queued requests of the same or a higher priority
+        return not any(
+            waiter[0] <= priority and not waiter[2].done() for waiter in self._waiters
+        )
+    
+    def _wake(self) -> None:
+        """Start queued requests while there are free slots."""
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= self._capacity(priority):
+                return
+            heapq.heappop(self._waiters)
+            self._active += 1
+            future.set_result(None)
+    
+    def _release(self) -> None:
+        """Free a slot."""
+        self._active -= 1
+        self._wake()
+    
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Wait for a free slot and hold it for the duration of a request."""
+        stats = self.stats[priority]
+        stats.requests += 1
+        
+        if self._can_start(priority):
+            self._active += 1
+        else:
+            queued_at = time.monotonic()
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # The slot may have been handed over just before cancellation
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+            
+            wait = time.monotonic() - queued_at
+            stats.queued += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+        
+        try:
+            yield
+        finally:
+            self._release()
+    
+    def as_dict(self) -> dict[str, Any]:
+        """Return the lane statistics as a dictionary."""
+        return {
+            lane: self.stats[priority].as_dict()
+            for priority, lane in PRIORITY_LANES.items()
+        }
+
+
 class SunshineAPI:
     """Sunshine API client."""
     
-    def __init__(self, token: str, base_url: str, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        token: str,
+        base_url: str,
+        session: aiohttp.ClientSession,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
         """Initialize the API client."""
         self.token = token
         self.base_url = base_url.rstrip('/')
         self._session = session
+        self.scheduler = RequestScheduler(max_concurrent_requests, COMMAND_CONNECTIONS)
+        self.recorder: TrafficRecorder | None = None
+        # Cleared once the server rejects or ignores ``fields=`` projections
+        self.fields_supported = True
         self._headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
@@ -34,21 +160,77 @@ class SunshineAPI:
             _LOGGER.error("Authentication test failed: %s", err)
             raise
     
-    async def _request(self, method: str, endpoint: str, **kwargs) -> dict[str, Any]:
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        **kwargs,
+    ) -> dict[str, Any]:
         """Make a request to the API."""
         url = f"{self.base_url}/api/v1{endpoint}"
         
-        async with self._session.request(method, url, headers=self._headers, **kwargs) as response:
-            response.raise_for_status()
-            return await response.json()
+        async with self.scheduler.slot(priority):
+            started = time.monotonic()
+            async with self._session.request(method, url, headers=self._headers, **kwargs) as response:
+                data = await response.json() if response.ok else None
+                if self.recorder is not None:
+                    self.recorder.record(
+                        method,
+                        endpoint,
+                        response.status,
+                        time.monotonic() - started,
+                        kwargs or None,
+                        data,
+                    )
+                response.raise_for_status()
+                return data
+    
+    async def _get_projected(
+        self, endpoint: str, priority: int, fields: Collection[str] | None
+    ) -> Any:
+        """Get a resource, asking the server for only the given top-level fields.
+        
+        Falls back to full documents for good once the server rejects or
+        ignores the projection.
+        """
+        if not fields or not self.fields_supported:
+            return await self._request("GET", endpoint, priority)
+        
+        try:
+            data = await self._request(
+                "GET", endpoint, priority, params={"fields": ",".join(sorted(fields))}
+            )
+        except aiohttp.ClientResponseError as err:
+            if err.status not in (400, 422):
+                raise
+            _LOGGER.info("Server rejected field projection, fetching full documents")
+            self.fields_supported = False
+            return await self._request("GET", endpoint, priority)
+        
+        documents = data if isinstance(data, list) else [data]
+        if any(document.keys() - fields for document in documents):
+            _LOGGER.info("Server ignores field projection, fetching full documents")
+            self.fields_supported = False
+        
+        return data
     
-    async def get_scooters(self) -> list[dict[str, Any]]:
+    async def get_scooters(
+        self,
+        priority: int = PRIORITY_BULK,
+        fields: Collection[str] | None = None,
+    ) -> list[dict[str, Any]]:
         """Get list of all scooters."""
-        return await self._request("GET", "/scooters")
+        return await self._get_projected("/scooters", priority, fields)
     
-    async def get_scooter(self, scooter_id: str) -> dict[str, Any]:
+    async def get_scooter(
+        self,
+        scooter_id: str,
+        priority: int = PRIORITY_BULK,
+        fields: Collection[str] | None = None,
+    ) -> dict[str, Any]:
         """Get details of a specific scooter."""
-        return await self._request("GET", f"/scooters/{scooter_id}")
+        return await self._get_projected(f"/scooters/{scooter_id}", priority, fields)
     
     async def get_config(self, vin: str) -> dict[str, Any]:
         """Get configuration for a specific scooter by VIN."""
@@ -3,18 +3,24 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Callable
+from typing import Any
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .command_queue import SunshineCommandQueue
 from .const import (
     BLINKER_BOTH,
     BLINKER_LEFT,
     BLINKER_OFF,
     BLINKER_RIGHT,
+    CATEGORY_CONTROLS,
+    CATEGORY_DIAGNOSTICS,
+    CATEGORY_FIRMWARE,
+    CATEGORY_SOUNDS,
     DOMAIN,
     SOUND_ALARM,
     SOUND_CHIRP,
@@ -22,6 +28,7 @@ from .const import (
 )
 from .coordinator import SunshineDataUpdateCoordinator
 from .entity import SunshineEntity
+from .firmware import SunshineFirmwareTracker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,8 +36,9 @@ _LOGGER = logging.getLogger(__name__)
 class SunshineButtonEntityDescription(ButtonEntityDescription):
     """Describes Sunshine button entity."""
     
-    press_fn: Callable[[Any, str], Any] | None = None
-    press_kwargs: dict[str, Any] | None = None
+    command: str
+    command_args: tuple[Any, ...] = ()
+    category: str = CATEGORY_CONTROLS
 
 
 BUTTON_TYPES: list[SunshineButtonEntityDescription] = [
@@ -38,43 +46,49 @@ BUTTON_TYPES: list[SunshineButtonEntityDescription] = [
         key="honk",
         name="Honk",
         icon="mdi:bullhorn",
-        press_fn=lambda api, scooter_id: api.honk(scooter_id),
+        command="honk",
+        category=CATEGORY_SOUNDS,
     ),
     SunshineButtonEntityDescription(
         key="locate",
         name="Locate",
         icon="mdi:map-marker",
-        press_fn=lambda api, scooter_id: api.locate(scooter_id),
+        command="locate",
+        category=CATEGORY_CONTROLS,
     ),
     SunshineButtonEntityDescription(
         key="ping",
         name="Ping",
         icon="mdi:access-point-network",
-        press_fn=lambda api, scooter_id: api.ping(scooter_id),
+        command="ping",
+        category=CATEGORY_DIAGNOSTICS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
     ),
     SunshineButtonEntityDescription(
         key="open_seatbox",
         name="Open Seatbox",
         icon="mdi:treasure-chest",
-        press_fn=lambda api, scooter_id: api.open_seatbox(scooter_id),
+        command="open_seatbox",
+        category=CATEGORY_CONTROLS,
     ),
     SunshineButtonEntityDescription(
         key="request_telemetry",
         name="Request Telemetry",
         icon="mdi:chart-line",
-        press_fn=lambda api, scooter_id: api.request_telemetry(scooter_id),
-    ),
-    SunshineButtonEntityDescription(
-        key="update_firmware",
-        name="Update Firmware",
-        icon="mdi:cellphone-arrow-down",
-        press_fn=lambda api, scooter_id: api.update_firmware(scooter_id),
+        command="request_telemetry",
+        category=CATEGORY_DIAGNOSTICS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
     ),
     SunshineButtonEntityDescription(
         key="alarm_5s",
         name="Alarm (5s)",
         icon="mdi:alarm-light",
-        press_fn=lambda api, scooter_id: api.trigger_alarm(scooter_id, "5s"),
+        command="trigger_alarm",
+        command_args=("5s",),
+        category=CATEGORY_SOUNDS,
+        entity_registry_enabled_default=False,
     ),
 ]
 
@@ -88,15 +102,28 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     api = data["api"]
     coordinator = data["coordinator"]
+    command_queue = data["command_queue"]
+    descriptions = [
+        description
+        for description in BUTTON_TYPES
+        if description.category in data["categories"]
+    ]
     
-    entities: list[SunshineButton] = []
+    entities: list[ButtonEntity] = []
     
     for scooter_id in coordinator.data:
-        for description in BUTTON_TYPES:
+        for description in descriptions:
+            entities.append(
+                SunshineButton(api, command_queue, coordinator, scooter_id, description)
+            )
+    
+    if CATEGORY_FIRMWARE in data["categories"]:
+        for scooter_id in coordinator.data:
             entities.append(
-                SunshineButton(api, coordinator, scooter_id, description)
+                SunshineFirmwareButton(data["firmware"], coordinator, scooter_id)
             )
     
+    data["unique_ids"].update(entity.unique_id for entity in entities)
     async_add_entities(entities)
 
 
@@ -108,6 +135,7 @@ class SunshineButton(SunshineEntity, ButtonEntity):
     def __init__(
         self,
         api,
+        command_queue: SunshineCommandQueue,
         coordinator: SunshineDataUpdateCoordinator,
         scooter_id: str,
         description: SunshineButtonEntityDescription,
@@ -115,19 +143,36 @@ class SunshineButton(SunshineEntity, ButtonEntity):
         """Initialize the button."""
         super().__init__(coordinator, scooter_id)
         self.api = api
+        self.command_queue = command_queue
         self.entity_description = description
         self._attr_unique_id = f"{scooter_id}_{description.key}"
     
     async def async_press(self) -> None:
         """Handle the button press."""
-        try:
-            if self.entity_description.press_fn:
-                await self.entity_description.press_fn(self.api, self.scooter_id)
-                await self.coordinator.async_request_refresh()
-        except Exception as err:
-            _LOGGER.error(
-                "Failed to press button %s for scooter %s: %s",
-                self.entity_description.key,
-                self.scooter_id,
-                err
-            )
\ No newline at end of file
+        self.command_queue.async_send(
+            self.scooter_id,
+            self.entity_description.command,
+            *self.entity_description.command_args,
+        )
+
+
+class SunshineFirmwareButton(SunshineEntity, ButtonEntity):
+    """Start a firmware update, also when the API reports no newer version."""
+    
+    _attr_icon = "mdi:cellphone-arrow-down"
+    
+    def __init__(
+        self,
+        firmware: SunshineFirmwareTracker,
+        coordinator: SunshineDataUpdateCoordinator,
+        scooter_id: str,
+    ) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator, scooter_id)
+        self.firmware = firmware
+        self._attr_unique_id = f"{scooter_id}_update_firmware"
+        self._attr_name = "Update Firmware"
+    
+    async def async_press(self) -> None:
+        """Queue a firmware update of the scooter."""
+        self.firmware.async_schedule([self.scooter_id])
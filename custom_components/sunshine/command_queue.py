@@ -0,0 +1,267 @@
+"""Offline command queue for Sunshine Scooter integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .commands import SunshineCommandTracker
+from .const import DOMAIN
+from .coordinator import SunshineDataUpdateCoordinator
+from .listeners import KeyedListeners
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 1  # seconds
+
+# Commands sharing a key replace each other, the last one wins
+COALESCE_KEYS = {
+    "lock": "lock",
+    "unlock": "lock",
+    "blinkers": "blinkers",
+}
+
+# Seconds a queued command stays valid
+COMMAND_TTL = {
+    "lock": 600,
+    "unlock": 600,
+    "open_seatbox": 300,
+    "blinkers": 60,
+}
+DEFAULT_COMMAND_TTL = 120
+
+# Client errors that will not go away by sending the command again later
+RETRYABLE_STATUSES = {408, 425, 429}
+
+
+def is_online(scooter: dict[str, Any]) -> bool:
+    """Return true unless the API reports the scooter as offline."""
+    for key in ("online", "is_online"):
+        if key in scooter:
+            return bool(scooter[key])
+    return True
+
+
+def _is_permanent_error(err: Exception) -> bool:
+    """Return true if sending a command again later cannot succeed."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return 400 <= err.status < 500 and err.status not in RETRYABLE_STATUSES
+    return not isinstance(err, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+@dataclass
+class QueuedCommand:
+    """A command waiting to be delivered to a scooter."""
+
+    command: str
+    args: list[Any]
+    queued_at: float
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        """Return true if the command is no longer worth sending."""
+        return time.time() >= self.expires_at
+
+
+class SunshineCommandQueue:
+    """Persistent per-scooter command queue with coalescing and expiry.
+
+    Every command is queued and delivered in order as soon as the scooter is
+    reachable. Redundant commands are collapsed while they wait, so a burst
+    of toggles only sends the last state. Commands that cannot be delivered
+    are kept until the coordinator sees the scooter online again, or until
+    they expire.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        commands: SunshineCommandTracker,
+        coordinator: SunshineDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the command queue."""
+        self.hass = hass
+        self.commands = commands
+        self.coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.command_queue.{entry_id}"
+        )
+        self._queues: dict[str, dict[str, QueuedCommand]] = {}
+        self._draining: dict[str, asyncio.Task] = {}
+        self._listeners: KeyedListeners[str] = KeyedListeners()
+
+    async def async_load(self) -> None:
+        """Restore commands that were queued before a restart."""
+        if not (stored := await self._store.async_load()):
+            return
+
+        for scooter_id, queued in stored.get("queues", {}).items():
+            queue = {
+                key: command
+                for key, data in queued.items()
+                if not (command := QueuedCommand(**data)).expired
+            }
+            if queue:
+                self._queues[scooter_id] = queue
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the queued commands to store."""
+        return {
+            "queues": {
+                scooter_id: {key: asdict(command) for key, command in queue.items()}
+                for scooter_id, queue in self._queues.items()
+                if queue
+            }
+        }
+
+    async def async_shutdown(self) -> None:
+        """Stop delivering commands and store the queue."""
+        tasks = list(self._draining.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._draining.clear()
+        await self._store.async_save(self._data_to_save())
+
+    def depth(self, scooter_id: str) -> int:
+        """Return the number of commands waiting for a scooter."""
+        return len(self._queues.get(scooter_id, ()))
+
+    @callback
+    def async_add_listener(
+        self, scooter_id: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for queue changes of a single scooter."""
+        return self._listeners.async_add(scooter_id, update_callback)
+
+    @callback
+    def _async_changed(self, scooter_id: str) -> None:
+        """Store the queue and notify listeners of a scooter."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._listeners.async_notify(scooter_id)
+
+    @callback
+    def async_send(self, scooter_id: str, command: str, *args: Any) -> None:
+        """Queue a command and deliver it as soon as the scooter is reachable."""
+        queue = self._queues.setdefault(scooter_id, {})
+        key = COALESCE_KEYS.get(command, command)
+
+        if queue.pop(key, None) is not None:
+            _LOGGER.debug("Replacing queued %s command of scooter %s", key, scooter_id)
+
+        now = time.time()
+        queue[key] = QueuedCommand(
+            command=command,
+            args=list(args),
+            queued_at=now,
+            expires_at=now + COMMAND_TTL.get(command, DEFAULT_COMMAND_TTL),
+        )
+        self._async_changed(scooter_id)
+
+        scooter = self.coordinator.data.get(scooter_id) if self.coordinator.data else None
+        if scooter is None or is_online(scooter):
+            self._async_start_drain(scooter_id)
+        else:
+            _LOGGER.info(
+                "Scooter %s is offline, %s will be sent when it is back online",
+                scooter_id,
+                command,
+            )
+
+    @callback
+    def _async_expire(self, scooter_id: str, key: str, queued: QueuedCommand) -> None:
+        """Drop an expired command and count it as failed."""
+        _LOGGER.warning(
+            "Dropping expired %s command of scooter %s", queued.command, scooter_id
+        )
+        self._queues[scooter_id].pop(key, None)
+        self.commands.async_record_failure(queued.command)
+        self._async_changed(scooter_id)
+
+    @callback
+    def async_handle_coordinator_update(self) -> None:
+        """Expire stale commands and deliver queued ones to scooters online again."""
+        for scooter_id in [
+            scooter_id for scooter_id, queue in self._queues.items() if queue
+        ]:
+            if scooter_id in self._draining:
+                continue
+
+            queue = self._queues[scooter_id]
+            for key, queued in list(queue.items()):
+                if queued.expired:
+                    self._async_expire(scooter_id, key, queued)
+            if not queue:
+                self._queues.pop(scooter_id, None)
+                continue
+
+            if (scooter := self.coordinator.data.get(scooter_id)) and is_online(scooter):
+                self._async_start_drain(scooter_id)
+
+    @callback
+    def _async_start_drain(self, scooter_id: str) -> None:
+        """Start delivering queued commands of a scooter."""
+        if scooter_id in self._draining:
+            return
+        self._draining[scooter_id] = self.hass.async_create_background_task(
+            self._async_drain(scooter_id),
+            f"sunshine command queue {scooter_id}",
+        )
+
+    async def _async_drain(self, scooter_id: str) -> None:
+        """Send queued commands of a scooter in order."""
+        queue = self._queues[scooter_id]
+        delivered = False
+        try:
+            while queue:
+                key, queued = next(iter(queue.items()))
+
+                if queued.expired:
+                    self._async_expire(scooter_id, key, queued)
+                    continue
+
+                try:
+                    await self.commands.async_send(scooter_id, queued.command, *queued.args)
+                except Exception as err:
+                    if not _is_permanent_error(err):
+                        _LOGGER.info(
+                            "Scooter %s is unreachable, keeping %d queued commands: %s",
+                            scooter_id,
+                            len(queue),
+                            err,
+                        )
+                        break
+                    _LOGGER.error(
+                        "Failed to send %s to scooter %s: %s",
+                        queued.command,
+                        scooter_id,
+                        err,
+                    )
+                    self.commands.async_record_failure(queued.command)
+                else:
+                    delivered = True
+
+                # A newer command may have replaced this one while it was sent
+                if queue.get(key) is queued:
+                    del queue[key]
+                self._async_changed(scooter_id)
+        finally:
+            self._draining.pop(scooter_id, None)
+
+        if not queue:
+            self._queues.pop(scooter_id, None)
+
+        if delivered:
+            await self.coordinator.async_request_refresh()
@@ -0,0 +1,175 @@
+"""Command confirmation tracking for Sunshine Scooter integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .api import SunshineAPI
+from .const import PRIORITY_TARGETED, UNLOCKED_STATES
+from .coordinator import SunshineDataUpdateCoordinator
+from .listeners import KeyedListeners
+
+_LOGGER = logging.getLogger(__name__)
+
+CONFIRM_TIMEOUT = 60  # seconds
+CONFIRM_POLL_MIN = 1.0  # seconds
+CONFIRM_POLL_MAX = 8.0  # seconds
+
+# Post-conditions that show a scooter has acted on a command, false while
+# the field they depend on is unknown
+COMMAND_CONDITIONS: dict[str, Callable[..., bool]] = {
+    "lock": lambda scooter: scooter.get("state") not in (None, *UNLOCKED_STATES),
+    "unlock": lambda scooter: scooter.get("state") in UNLOCKED_STATES,
+    "open_seatbox": lambda scooter: scooter.get("seatbox") == "open",
+    "blinkers": lambda scooter, state: scooter.get("blinkers") == state,
+}
+
+
+@dataclass
+class CommandStats:
+    """Confirmation statistics of a command type."""
+
+    confirmed: int = 0
+    failed: int = 0
+    last_latency: float | None = None
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Return the mean time to confirm."""
+        if not self.confirmed:
+            return None
+        return self.total_latency / self.confirmed
+
+
+class SunshineCommandTracker:
+    """Send commands and measure how long scooters take to act on them.
+
+    After a command with a known post-condition is accepted, only the
+    commanded scooter is polled, with growing intervals, until the condition
+    holds or the confirmation times out. A command whose condition already
+    held in the last refresh is not tracked, as polling could not tell
+    whether the scooter acted on it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: SunshineAPI,
+        coordinator: SunshineDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the command tracker."""
+        self.hass = hass
+        self.api = api
+        self.coordinator = coordinator
+        self.stats: dict[str, CommandStats] = {
+            command: CommandStats() for command in COMMAND_CONDITIONS
+        }
+        self._pending: dict[tuple[str, str], asyncio.Task] = {}
+        self._listeners: KeyedListeners[str] = KeyedListeners()
+
+    @callback
+    def async_add_listener(
+        self, command: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for statistics changes of a command type."""
+        return self._listeners.async_add(command, update_callback)
+
+    @callback
+    def async_record_failure(self, command: str) -> None:
+        """Record a command that could not be delivered."""
+        if stats := self.stats.get(command):
+            stats.failed += 1
+            self._listeners.async_notify(command)
+
+    async def async_send(self, scooter_id: str, command: str, *args: Any) -> Any:
+        """Send a command to a scooter and track its confirmation.
+
+        Errors are raised to the caller, which decides whether the command
+        has failed or will be retried.
+        """
+        condition = COMMAND_CONDITIONS.get(command)
+        scooter = (self.coordinator.data or {}).get(scooter_id)
+        held = condition is not None and scooter is not None and condition(scooter, *args)
+
+        sent_at = time.monotonic()
+        result = await getattr(self.api, command)(scooter_id, *args)
+
+        if condition is not None:
+            key = (scooter_id, command)
+            # A newer command of the same type supersedes the pending one
+            if pending := self._pending.pop(key, None):
+                pending.cancel()
+            if held:
+                _LOGGER.debug(
+                    "Not confirming %s of scooter %s, its state already matched",
+                    command,
+                    scooter_id,
+                )
+                return result
+            self._pending[key] = self.hass.async_create_background_task(
+                self._async_confirm(scooter_id, command, args, sent_at),
+                f"sunshine confirm {command} {scooter_id}",
+            )
+
+        return result
+
+    async def _async_confirm(
+        self, scooter_id: str, command: str, args: tuple[Any, ...], sent_at: float
+    ) -> None:
+        """Poll a scooter until the command's post-condition holds."""
+        condition = COMMAND_CONDITIONS[command]
+        stats = self.stats[command]
+        deadline = sent_at + CONFIRM_TIMEOUT
+        delay = CONFIRM_POLL_MIN
+
+        try:
+            while True:
+                await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+                delay = min(delay * 2, CONFIRM_POLL_MAX)
+
+                try:
+                    scooter = await self.api.get_scooter(scooter_id, PRIORITY_TARGETED)
+                except Exception as err:
+                    _LOGGER.debug(
+                        "Failed to poll scooter %s for %s confirmation: %s",
+                        scooter_id,
+                        command,
+                        err,
+                    )
+                else:
+                    if condition(scooter, *args):
+                        latency = time.monotonic() - sent_at
+                        stats.confirmed += 1
+                        stats.last_latency = latency
+                        stats.total_latency += latency
+                        break
+
+                if time.monotonic() >= deadline:
+                    _LOGGER.warning(
+                        "Scooter %s did not confirm %s within %s seconds",
+                        scooter_id,
+                        command,
+                        CONFIRM_TIMEOUT,
+                    )
+                    stats.failed += 1
+                    break
+        finally:
+            if self._pending.get((scooter_id, command)) is asyncio.current_task():
+                self._pending.pop((scooter_id, command))
+
+        self._listeners.async_notify(command)
+
+    async def async_shutdown(self) -> None:
+        """Stop tracking pending commands."""
+        tasks = list(self._pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending.clear()
@@ -1,6 +1,7 @@
 """Config flow for Sunshine Scooter integration."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
 from typing import Any
 
@@ -8,12 +9,36 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_TOKEN
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import SunshineAPI
-from .const import CONF_BASE_URL, DEFAULT_BASE_URL, DOMAIN
+from .const import (
+    CATEGORY_CONTROLS,
+    CATEGORY_DIAGNOSTICS,
+    CATEGORY_FIRMWARE,
+    CATEGORY_FLEET,
+    CATEGORY_SOUNDS,
+    CONF_BASE_URL,
+    CONF_BATTERY_DEADBAND,
+    CONF_CAPTURE_SCRUB_LOCATIONS,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_ENTITY_CATEGORIES,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MIN_DISTANCE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_SPEED_DEADBAND,
+    DEFAULT_BASE_URL,
+    DEFAULT_BATTERY_DEADBAND,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MIN_DISTANCE,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_SPEED_DEADBAND,
+    DOMAIN,
+    ENTITY_CATEGORIES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,12 +47,68 @@ STEP_USER_DATA_SCHEMA = vol.Schema({
     vol.Optional(CONF_BASE_URL, default=DEFAULT_BASE_URL): cv.string,
 })
 
+ENTITY_CATEGORY_LABELS = {
+    CATEGORY_CONTROLS: "Controls (lock, blinkers, locate, seatbox)",
+    CATEGORY_DIAGNOSTICS: "Diagnostics (ping, request telemetry, command confirmation)",
+    CATEGORY_SOUNDS: "Sounds (honk, alarm, play sound)",
+    CATEGORY_FIRMWARE: "Firmware updates",
+    CATEGORY_FLEET: "Fleet aggregates (scooter counts, battery, odometer)",
+}
+
+
+def options_schema(options: Mapping[str, Any]) -> vol.Schema:
+    """Return the options schema with the current options as defaults."""
+    return vol.Schema({
+        vol.Optional(
+            CONF_ENTITY_CATEGORIES,
+            default=options.get(CONF_ENTITY_CATEGORIES, ENTITY_CATEGORIES),
+        ): cv.multi_select(ENTITY_CATEGORY_LABELS),
+        vol.Optional(
+            CONF_SPEED_DEADBAND,
+            default=options.get(CONF_SPEED_DEADBAND, DEFAULT_SPEED_DEADBAND),
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_BATTERY_DEADBAND,
+            default=options.get(CONF_BATTERY_DEADBAND, DEFAULT_BATTERY_DEADBAND),
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_MIN_DISTANCE,
+            default=options.get(CONF_MIN_DISTANCE, DEFAULT_MIN_DISTANCE),
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_MIN_WRITE_INTERVAL,
+            default=options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL),
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_MAX_CONCURRENT_REQUESTS,
+            default=options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            ),
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+        vol.Optional(
+            CONF_CAPTURE_TRAFFIC,
+            default=options.get(CONF_CAPTURE_TRAFFIC, False),
+        ): cv.boolean,
+        vol.Optional(
+            CONF_CAPTURE_SCRUB_LOCATIONS,
+            default=options.get(CONF_CAPTURE_SCRUB_LOCATIONS, True),
+        ): cv.boolean,
+    })
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Sunshine Scooter."""
     
     VERSION = 1
     
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+    
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -59,4 +140,24 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Sunshine Scooter options."""
+    
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+    
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+        
+        return self.async_show_form(
+            step_id="init",
+            data_schema=options_schema(self._entry.options),
+        )
@@ -1,11 +1,70 @@
 """Constants for the Sunshine Scooter integration."""
 from __future__ import annotations
 
+from homeassistant.const import Platform
+
 DOMAIN = "sunshine"
 
 CONF_BASE_URL = "base_url"
 DEFAULT_BASE_URL = "https://rescoot.org"
 
+CONF_ENTITY_CATEGORIES = "entity_categories"
+CONF_SPEED_DEADBAND = "speed_deadband"
+CONF_BATTERY_DEADBAND = "battery_deadband"
+CONF_MIN_DISTANCE = "min_distance"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_CAPTURE_SCRUB_LOCATIONS = "capture_scrub_locations"
+
+DEFAULT_SPEED_DEADBAND = 1.0  # km/h
+DEFAULT_BATTERY_DEADBAND = 1.0  # %
+DEFAULT_MIN_DISTANCE = 10.0  # meters
+DEFAULT_MIN_WRITE_INTERVAL = 0.0  # seconds
+
+CAPTURE_FILENAME = "sunshine_capture.ndjson"
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+# Connections kept free of polling so commands never wait for the pool
+COMMAND_CONNECTIONS = 2
+
+# Request priorities, lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_TARGETED = 1
+PRIORITY_BULK = 2
+
+PRIORITY_LANES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_TARGETED: "targeted",
+    PRIORITY_BULK: "bulk",
+}
+
+CATEGORY_CONTROLS = "controls"
+CATEGORY_DIAGNOSTICS = "diagnostics"
+CATEGORY_SOUNDS = "sounds"
+CATEGORY_FIRMWARE = "firmware"
+CATEGORY_FLEET = "fleet"
+
+ENTITY_CATEGORIES = [
+    CATEGORY_CONTROLS,
+    CATEGORY_DIAGNOSTICS,
+    CATEGORY_SOUNDS,
+    CATEGORY_FIRMWARE,
+    CATEGORY_FLEET,
+]
+
+# Sensors and the device tracker are always created, everything else is
+# only set up when one of its categories is enabled
+CORE_PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.DEVICE_TRACKER]
+CATEGORY_PLATFORMS: dict[str, list[Platform]] = {
+    CATEGORY_CONTROLS: [Platform.SWITCH, Platform.SELECT, Platform.BUTTON],
+    CATEGORY_DIAGNOSTICS: [Platform.BUTTON],
+    CATEGORY_SOUNDS: [Platform.SELECT, Platform.BUTTON],
+    CATEGORY_FIRMWARE: [Platform.UPDATE, Platform.BUTTON],
+    CATEGORY_FLEET: [Platform.SENSOR],
+}
+
 ATTR_SCOOTER_ID = "scooter_id"
 ATTR_VIN = "vin"
 ATTR_DURATION = "duration"
@@ -23,7 +82,34 @@ SOUND_ALARM = "alarm"
 SOUND_CHIRP = "chirp"
 SOUND_FIND_ME = "find_me"
 
+# The scooter is unlocked in these states, any other state means locked
+UNLOCKED_STATES = ["parked", "ready-to-drive"]
+
 BLINKER_LEFT = "left"
 BLINKER_RIGHT = "right"
 BLINKER_BOTH = "both"
-BLINKER_OFF = "off"
\ No newline at end of file
+BLINKER_OFF = "off"
+ATTR_MAX_CONCURRENT = "max_concurrent"
+
+DEFAULT_FIRMWARE_MAX_CONCURRENT = 3
+
+FIRMWARE_STATUS_QUEUED = "queued"
+FIRMWARE_STATUS_UPDATING = "updating"
+FIRMWARE_STATUS_COMPLETED = "completed"
+FIRMWARE_STATUS_FAILED = "failed"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_FORMAT = "format"
+ATTR_FILENAME = "filename"
+ATTR_COMPRESS = "compress"
+ATTR_INCREMENTAL = "incremental"
+
+SERVICE_EXPORT_SNAPSHOT = "export_snapshot"
+
+ATTR_CYCLES = "cycles"
+
+SERVICE_PROFILE = "profile"
+
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMATS = [EXPORT_FORMAT_NDJSON, EXPORT_FORMAT_CSV]
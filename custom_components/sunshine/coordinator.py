@@ -2,20 +2,25 @@
 from __future__ import annotations
 
 import asyncio
+from collections import Counter
 from datetime import timedelta
 import logging
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import SunshineAPI
 from .const import DOMAIN
+from .profiler import RefreshProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
 UPDATE_INTERVAL = timedelta(seconds=30)
 
+# Fields needed for device info and command delivery, whatever entities exist
+BASE_FIELDS = ("id", "vin", "model", "online", "is_online")
+
 
 class SunshineDataUpdateCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
     """Class to manage fetching Sunshine data from the API."""
@@ -33,22 +38,86 @@ class SunshineDataUpdateCoordinator(DataUpdateCoordinator[dict[str, dict[str, An
             update_interval=UPDATE_INTERVAL,
         )
         self.api = api
+        self.suppressed_writes: Counter[str] = Counter()
+        self._field_users: Counter[str] = Counter()
+        self.profiler: RefreshProfiler | None = None
+        # Scooters whose data changed or disappeared in the latest refresh
+        self.changed_scooters: set[str] = set()
+        self.removed_scooters: set[str] = set()
+    
+    @callback
+    def async_register_fields(self, fields: tuple[str, ...]) -> CALLBACK_TYPE:
+        """Register scooter fields an entity reads, until the returned callback runs."""
+        self._field_users.update(fields)
+        
+        @callback
+        def unregister() -> None:
+            self._field_users.subtract(fields)
+        
+        return unregister
+    
+    @property
+    def fields(self) -> set[str] | None:
+        """Return the scooter fields to fetch, or None to fetch everything."""
+        if not +self._field_users:
+            return None
+        return set(BASE_FIELDS) | set(+self._field_users)
+    
+    async def _async_refresh(
+        self,
+        log_failures: bool = True,
+        raise_on_auth_failed: bool = False,
+        scheduled: bool = False,
+        raise_on_entry_error: bool = False,
+    ) -> None:
+        """Refresh data and notify listeners, profiling the refresh if requested."""
+        if (profiler := self.profiler) is not None and not profiler.start_cycle():
+            self.profiler = profiler = None
+        
+        try:
+            await super()._async_refresh(
+                log_failures, raise_on_auth_failed, scheduled, raise_on_entry_error
+            )
+        finally:
+            # Failed refreshes end the cycle too, listeners are not always called
+            if profiler is not None:
+                profiler.end_cycle()
+                if profiler.done and self.profiler is profiler:
+                    self.profiler = None
+                    self.hass.async_create_background_task(
+                        profiler.async_finish(), f"{DOMAIN} profile"
+                    )
     
     async def _async_update_data(self) -> dict[str, dict[str, Any]]:
         """Update data via API."""
+        self.changed_scooters = set()
+        self.removed_scooters = set()
+        
         try:
-            scooters_list = await self.api.get_scooters()
-            if not scooters_list:
-                return {}
+            fields = self.fields
+            scooters_list = await self.api.get_scooters(fields=("id",) if fields else None)
             
-            # Fetch detailed data for each scooter
-            tasks = [self.api.get_scooter(scooter["id"]) for scooter in scooters_list]
+            # Fetch detailed data for each scooter, the API client limits
+            # concurrency and lets commands go first
+            tasks = [
+                self.api.get_scooter(scooter["id"], fields=fields)
+                for scooter in scooters_list or ()
+            ]
             detailed_scooters = await asyncio.gather(*tasks)
-            
-            return {
-                scooter["id"]: scooter
-                for scooter in detailed_scooters
-                if "id" in scooter
-            }
         except Exception as err:
-            raise UpdateFailed(f"Failed to fetch scooter data: {err}") from err
\ No newline at end of file
+            raise UpdateFailed(f"Failed to fetch scooter data: {err}") from err
+        
+        data = {
+            scooter["id"]: scooter
+            for scooter in detailed_scooters
+            if "id" in scooter
+        }
+        
+        previous = self.data or {}
+        self.changed_scooters = {
+            scooter_id
+            for scooter_id, scooter in data.items()
+            if previous.get(scooter_id) != scooter
+        }
+        self.removed_scooters = previous.keys() - data.keys()
+        return data
\ No newline at end of file
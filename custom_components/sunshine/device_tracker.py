@@ -9,9 +9,16 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import (
+    CONF_MIN_DISTANCE,
+    CONF_MIN_WRITE_INTERVAL,
+    DEFAULT_MIN_DISTANCE,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DOMAIN,
+)
 from .coordinator import SunshineDataUpdateCoordinator
 from .entity import SunshineEntity
+from .filters import StateWriteFilter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,12 +32,24 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     api = data["api"]
     coordinator = data["coordinator"]
+    options = config_entry.options
+    min_distance = options.get(CONF_MIN_DISTANCE, DEFAULT_MIN_DISTANCE)
+    min_interval = options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL)
     
     entities: list[SunshineDeviceTracker] = []
     
     for scooter_id in coordinator.data:
-        entities.append(SunshineDeviceTracker(api, coordinator, scooter_id))
+        write_filter = StateWriteFilter(
+            "location",
+            min_delta=min_distance,
+            min_interval=min_interval,
+            distance=True,
+        )
+        entities.append(
+            SunshineDeviceTracker(api, coordinator, scooter_id, write_filter)
+        )
     
+    data["unique_ids"].update(entity.unique_id for entity in entities)
     async_add_entities(entities)
 
 
@@ -42,6 +61,7 @@ class SunshineDeviceTracker(SunshineEntity, TrackerEntity):
         api,
         coordinator: SunshineDataUpdateCoordinator,
         scooter_id: str,
+        write_filter: StateWriteFilter | None = None,
     ) -> None:
         """Initialize the device tracker."""
         super().__init__(coordinator, scooter_id)
@@ -49,6 +69,20 @@ class SunshineDeviceTracker(SunshineEntity, TrackerEntity):
         self._attr_unique_id = f"{scooter_id}_tracker"
         self._attr_icon = "mdi:scooter"
         self._attr_name = "Location"
+        self._write_filter = write_filter
+        self._fields = ("location", "location_accuracy", "batteries")
+    
+    def _write_filter_value(self) -> tuple[float, float] | None:
+        """Return the position compared by the write filter."""
+        latitude = self.latitude
+        longitude = self.longitude
+        if latitude is None or longitude is None:
+            return None
+        return (latitude, longitude)
+    
+    def _unfiltered_value(self) -> int | None:
+        """Return the battery level, written even while the scooter is parked."""
+        return self.battery_level
     
     @property
     def latitude(self) -> float | None:
@@ -0,0 +1,37 @@
+"""Diagnostics support for Sunshine Scooter integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+    session = data["session"]
+    
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "scooters": len(coordinator.data),
+        "platforms": [str(platform) for platform in data["platforms"]],
+        "suppressed_writes": dict(coordinator.suppressed_writes),
+        "request_lanes": data["api"].scheduler.as_dict(),
+        "connection_pool": {
+            "limit": session.limit,
+            **session.stats.as_dict(),
+        },
+    }
@@ -3,21 +3,66 @@ from __future__ import annotations
 
 from typing import Any
 
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import SunshineDataUpdateCoordinator
+from .filters import StateWriteFilter
 
 
 class SunshineEntity(CoordinatorEntity[SunshineDataUpdateCoordinator]):
     """Base class for Sunshine entities."""
     
     _attr_has_entity_name = True
+    _write_filter: StateWriteFilter | None = None
+    # Top-level scooter fields read by the entity, fetched while it is enabled
+    _fields: tuple[str, ...] = ()
     
     def __init__(self, coordinator: SunshineDataUpdateCoordinator, scooter_id: str) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
         self.scooter_id = scooter_id
+        self._written_available: bool | None = None
+        self._written_unfiltered: Any = None
+    
+    async def async_added_to_hass(self) -> None:
+        """Register the fields this entity needs with the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_register_fields(self._fields))
+    
+    def _write_filter_value(self) -> Any:
+        """Return the value compared by the write filter."""
+        return None
+    
+    def _unfiltered_value(self) -> Any:
+        """Return the attributes that are written on every change, despite the write filter."""
+        return None
+    
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, skipping insignificant changes."""
+        available = self.available
+        
+        if write_filter := self._write_filter:
+            value = self._write_filter_value()
+            unfiltered = self._unfiltered_value()
+            if (
+                available
+                and self._written_available
+                and unfiltered == self._written_unfiltered
+            ):
+                if not write_filter.should_write(value):
+                    self.coordinator.suppressed_writes[write_filter.name] += 1
+                    return
+            else:
+                write_filter.reset(value)
+            self._written_unfiltered = unfiltered
+        
+        self._written_available = available
+        self.async_write_ha_state()
     
     @property
     def device_info(self) -> dict[str, Any]:
@@ -28,4 +73,26 @@ class SunshineEntity(CoordinatorEntity[SunshineDataUpdateCoordinator]):
             "name": f"Scooter {scooter.get('vin', self.scooter_id)}",
             "model": scooter.get("model", "Unknown"),
             "manufacturer": "Sunshine",
-        }
\ No newline at end of file
+        }
+
+
+class SunshineHubEntity(Entity):
+    """Base class for entities of the fleet hub device."""
+    
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    
+    def __init__(self, entry_id: str) -> None:
+        """Initialize the entity."""
+        self.entry_id = entry_id
+    
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, self.entry_id)},
+            "name": "Sunshine Fleet",
+            "model": "Fleet",
+            "manufacturer": "Sunshine",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
@@ -0,0 +1,272 @@
+"""Fleet snapshot export for Sunshine Scooter integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Iterator
+import csv
+from dataclasses import dataclass
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import IO, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import SunshineAPI
+from .const import DOMAIN, EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Scooters fetched and written at a time
+EXPORT_BATCH_SIZE = 50
+
+# Fixed CSV columns, nested fields are flattened
+CSV_COLUMNS = (
+    "exported_at",
+    "id",
+    "vin",
+    "model",
+    "state",
+    "online",
+    "speed",
+    "odometer",
+    "battery_level",
+    "latitude",
+    "longitude",
+    "location_accuracy",
+    "blinkers",
+    "seatbox",
+    "firmware_version",
+)
+
+
+def resolve_config_path(hass: HomeAssistant, filename: str) -> str:
+    """Return the absolute path of a file inside the configuration directory."""
+    config_dir = os.path.realpath(hass.config.config_dir)
+    path = os.path.realpath(os.path.join(config_dir, filename))
+    if os.path.commonpath((config_dir, path)) != config_dir:
+        raise HomeAssistantError(
+            f"Path {filename} is outside the configuration directory"
+        )
+    return path
+
+
+def _digest(scooter: dict[str, Any]) -> str:
+    """Return a short fingerprint of a scooter document."""
+    encoded = json.dumps(scooter, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=8).hexdigest()
+
+
+def flatten(scooter: dict[str, Any], exported_at: str) -> dict[str, Any]:
+    """Return the CSV row of a scooter."""
+    location = scooter.get("location") or {}
+    battery0 = (scooter.get("batteries") or {}).get("battery0") or {}
+    online = scooter.get("online", scooter.get("is_online"))
+    return {
+        "exported_at": exported_at,
+        "id": scooter.get("id"),
+        "vin": scooter.get("vin"),
+        "model": scooter.get("model"),
+        "state": scooter.get("state"),
+        "online": online,
+        "speed": scooter.get("speed"),
+        "odometer": scooter.get("odometer"),
+        "battery_level": battery0.get("level"),
+        "latitude": location.get("lat"),
+        "longitude": location.get("lng"),
+        "location_accuracy": scooter.get("location_accuracy"),
+        "blinkers": scooter.get("blinkers"),
+        "seatbox": scooter.get("seatbox"),
+        "firmware_version": scooter.get("firmware_version"),
+    }
+
+
+def ndjson_lines(
+    scooters: Iterable[dict[str, Any]], exported_at: str, header: bool
+) -> Iterator[str]:
+    """Serialize scooters to NDJSON lines."""
+    for scooter in scooters:
+        yield json.dumps(
+            {"exported_at": exported_at, **scooter},
+            separators=(",", ":"),
+            default=str,
+        ) + "\n"
+
+
+def csv_lines(
+    scooters: Iterable[dict[str, Any]], exported_at: str, header: bool
+) -> Iterator[str]:
+    """Serialize scooters to CSV lines, starting with the header if asked."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_COLUMNS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    for scooter in scooters:
+        writer.writerow(flatten(scooter, exported_at))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+Serializer = Callable[[Iterable[dict[str, Any]], str, bool], Iterator[str]]
+
+SERIALIZERS: dict[str, Serializer] = {
+    EXPORT_FORMAT_NDJSON: ndjson_lines,
+    EXPORT_FORMAT_CSV: csv_lines,
+}
+
+
+def _open(path: str, compress: bool) -> IO[str]:
+    """Open an export file for writing."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _write_batch(
+    export_file: IO[str],
+    serializer: Serializer,
+    scooters: list[dict[str, Any]],
+    exported_at: str,
+    header: bool,
+    previous: dict[str, str],
+    digests: dict[str, str],
+) -> int:
+    """Write the changed scooters of a batch and return how many were written."""
+    count = 0
+
+    def changed() -> Iterator[dict[str, Any]]:
+        nonlocal count
+        for scooter in scooters:
+            digests[scooter["id"]] = digest = _digest(scooter)
+            if previous.get(scooter["id"]) != digest:
+                count += 1
+                yield scooter
+
+    export_file.writelines(serializer(changed(), exported_at, header))
+    return count
+
+
+def _discard(export_file: IO[str], path: str) -> None:
+    """Close and remove an unfinished export file."""
+    export_file.close()
+    os.remove(path)
+
+
+@dataclass
+class ExportResult:
+    """Outcome of a snapshot export."""
+
+    path: str
+    scooters: int
+    incremental: bool
+    since: str | None
+
+
+class SunshineSnapshotExporter:
+    """Stream the fleet state to files in the configuration directory.
+
+    Complete scooter documents are fetched from the API in batches, not
+    taken from the coordinator, which only holds the fields entities read.
+    Each batch is serialized by generators and appended to the file in an
+    executor before the next one is fetched, so memory use does not grow
+    with the fleet. For incremental exports, a fingerprint of every
+    exported scooter is kept together with the time of the export, and
+    only scooters whose document changed since then are written.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, api: SunshineAPI) -> None:
+        """Initialize the exporter."""
+        self.hass = hass
+        self.api = api
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.export.{entry_id}"
+        )
+        self._watermark: str | None = None
+        self._digests: dict[str, str] = {}
+        self._loaded = False
+
+    async def _async_load(self) -> None:
+        """Load the watermark of the last export."""
+        if self._loaded:
+            return
+        if stored := await self._store.async_load():
+            self._watermark = stored.get("watermark")
+            self._digests = stored.get("digests", {})
+        self._loaded = True
+
+    async def async_export(
+        self,
+        export_format: str,
+        filename: str | None = None,
+        compress: bool = False,
+        incremental: bool = False,
+    ) -> ExportResult:
+        """Export the current fleet state."""
+        await self._async_load()
+
+        now = dt_util.utcnow()
+        exported_at = now.isoformat()
+        if filename is None:
+            filename = f"sunshine_snapshot_{now.strftime('%Y%m%dT%H%M%SZ')}.{export_format}"
+            if compress:
+                filename += ".gz"
+        path = resolve_config_path(self.hass, filename)
+
+        serializer = SERIALIZERS[export_format]
+        since = self._watermark if incremental else None
+        previous = self._digests if incremental else {}
+        digests: dict[str, str] = {}
+        count = 0
+
+        export_file = await self.hass.async_add_executor_job(_open, path, compress)
+        try:
+            scooter_ids = [
+                scooter["id"] for scooter in await self.api.get_scooters(fields=("id",))
+            ]
+            for start in range(0, max(len(scooter_ids), 1), EXPORT_BATCH_SIZE):
+                batch = await asyncio.gather(
+                    *(
+                        self.api.get_scooter(scooter_id)
+                        for scooter_id in scooter_ids[start : start + EXPORT_BATCH_SIZE]
+                    )
+                )
+                count += await self.hass.async_add_executor_job(
+                    _write_batch,
+                    export_file,
+                    serializer,
+                    batch,
+                    exported_at,
+                    start == 0,
+                    previous,
+                    digests,
+                )
+        except asyncio.CancelledError:
+            await self.hass.async_add_executor_job(_discard, export_file, path)
+            raise
+        except Exception as err:
+            await self.hass.async_add_executor_job(_discard, export_file, path)
+            raise HomeAssistantError(f"Failed to export snapshot: {err}") from err
+        await self.hass.async_add_executor_job(export_file.close)
+
+        self._watermark = exported_at
+        self._digests = digests
+        await self._store.async_save(
+            {"watermark": self._watermark, "digests": self._digests}
+        )
+
+        _LOGGER.debug("Exported %d scooters to %s", count, path)
+        return ExportResult(path, count, incremental, since)
+
@@ -0,0 +1,83 @@
+"""State write filters for Sunshine Scooter integration."""
+from __future__ import annotations
+
+import math
+import time
+from typing import Any
+
+EARTH_RADIUS = 6371008.8  # meters
+
+_UNSET = object()
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two coordinates in meters."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+class StateWriteFilter:
+    """Decide whether a new value is worth writing to the state machine.
+
+    A value is written when it differs from the last written value by at
+    least ``min_delta`` and at least ``min_interval`` seconds have passed
+    since the last write. Positions are compared as ``(lat, lon)`` tuples by
+    their distance in meters. Changes to or from ``None`` and non-numeric
+    changes are always written.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_delta: float = 0,
+        min_interval: float = 0,
+        distance: bool = False,
+    ) -> None:
+        """Initialize the filter."""
+        self.name = name
+        self.min_delta = min_delta
+        self.min_interval = min_interval
+        self.distance = distance
+        self._last_value: Any = _UNSET
+        self._last_write = 0.0
+
+    def _delta(self, value: Any) -> float | None:
+        """Return how far a value is from the last written one."""
+        try:
+            if self.distance:
+                return haversine_distance(*self._last_value, *value)
+            return abs(float(value) - float(self._last_value))
+        except (ValueError, TypeError):
+            return None
+
+    def should_write(self, value: Any) -> bool:
+        """Return true if the value should be written, and remember it if so."""
+        now = time.monotonic()
+
+        if (
+            self._last_value is not _UNSET
+            and value is not None
+            and self._last_value is not None
+            and (delta := self._delta(value)) is not None
+        ):
+            if delta < self.min_delta:
+                return False
+            if now - self._last_write < self.min_interval:
+                return False
+
+        self._last_value = value
+        self._last_write = now
+        return True
+
+    def reset(self, value: Any) -> None:
+        """Remember a value that was written without consulting the filter."""
+        self._last_value = value
+        self._last_write = time.monotonic()
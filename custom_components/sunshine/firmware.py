@@ -0,0 +1,231 @@
+"""Firmware update tracking for Sunshine Scooter integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .api import SunshineAPI
+from .const import (
+    DEFAULT_FIRMWARE_MAX_CONCURRENT,
+    FIRMWARE_STATUS_COMPLETED,
+    FIRMWARE_STATUS_FAILED,
+    FIRMWARE_STATUS_QUEUED,
+    FIRMWARE_STATUS_UPDATING,
+    PRIORITY_TARGETED,
+)
+from .listeners import KeyedListeners
+
+_LOGGER = logging.getLogger(__name__)
+
+FIRMWARE_UPDATE_TIMEOUT = 3600  # seconds
+
+# Poll interval by reported progress: slow while downloading, fast near the end
+POLL_SCHEDULE: tuple[tuple[int, float], ...] = (
+    (50, 60.0),
+    (90, 20.0),
+    (100, 5.0),
+)
+
+
+def firmware_installed_version(scooter: dict[str, Any]) -> str | None:
+    """Return the firmware version installed on a scooter."""
+    return scooter.get("firmware_version")
+
+
+def firmware_latest_version(scooter: dict[str, Any]) -> str | None:
+    """Return the newest firmware version available, None if the API does not know."""
+    return scooter.get("latest_firmware_version")
+
+
+def firmware_status(scooter: dict[str, Any]) -> str | None:
+    """Return the firmware update status reported by the API."""
+    if firmware_update := scooter.get("firmware_update"):
+        return firmware_update.get("status")
+    return None
+
+
+def firmware_progress(scooter: dict[str, Any]) -> int | None:
+    """Return the firmware update progress reported by the API."""
+    if firmware_update := scooter.get("firmware_update"):
+        if (progress := firmware_update.get("progress")) is not None:
+            try:
+                return max(0, min(100, int(progress)))
+            except (ValueError, TypeError):
+                _LOGGER.warning("Invalid firmware progress value: %s", progress)
+    return None
+
+
+def _poll_interval(progress: int | None) -> float:
+    """Return how long to wait before polling an updating scooter again."""
+    for threshold, interval in POLL_SCHEDULE:
+        if progress is None or progress < threshold:
+            return interval
+    return POLL_SCHEDULE[-1][1]
+
+
+@dataclass
+class FirmwareRollout:
+    """Scooters scheduled together, sharing a concurrency cap."""
+
+    max_concurrent: int
+    active: int = 0
+
+
+@dataclass
+class FirmwareUpdateState:
+    """Progress of a firmware update on a single scooter."""
+
+    status: str
+    progress: int | None = None
+    from_version: str | None = None
+
+
+class SunshineFirmwareTracker:
+    """Run firmware updates and poll the updating scooters until they finish.
+
+    Updates are started in the order they were scheduled, and at most
+    ``max_concurrent`` scooters are updating at any time, whichever rollout
+    they belong to. Every call to ``async_schedule`` is a rollout that may
+    lower that cap for its own scooters. Only scooters with an active update
+    are polled.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: SunshineAPI,
+        max_concurrent: int = DEFAULT_FIRMWARE_MAX_CONCURRENT,
+    ) -> None:
+        """Initialize the firmware tracker."""
+        self.hass = hass
+        self.api = api
+        self.states: dict[str, FirmwareUpdateState] = {}
+        self.max_concurrent = max_concurrent
+        self._pending: deque[tuple[str, FirmwareRollout]] = deque()
+        self._active: dict[str, asyncio.Task] = {}
+        self._rollouts: dict[str, FirmwareRollout] = {}
+        self._listeners: KeyedListeners[str] = KeyedListeners()
+
+    def in_progress(self, scooter_id: str) -> bool:
+        """Return true if an update is queued or running for a scooter."""
+        if state := self.states.get(scooter_id):
+            return state.status in (FIRMWARE_STATUS_QUEUED, FIRMWARE_STATUS_UPDATING)
+        return False
+
+    @callback
+    def async_add_listener(
+        self, scooter_id: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for update progress changes of a single scooter."""
+        return self._listeners.async_add(scooter_id, update_callback)
+
+    @callback
+    def async_schedule(
+        self, scooter_ids: Iterable[str], max_concurrent: int | None = None
+    ) -> None:
+        """Queue firmware updates for the given scooters as one rollout."""
+        rollout = FirmwareRollout(
+            max(1, min(max_concurrent or self.max_concurrent, self.max_concurrent))
+        )
+        for scooter_id in scooter_ids:
+            if self.in_progress(scooter_id):
+                continue
+            self.states[scooter_id] = FirmwareUpdateState(status=FIRMWARE_STATUS_QUEUED)
+            self._pending.append((scooter_id, rollout))
+            self._listeners.async_notify(scooter_id)
+
+        self._async_start_next()
+
+    @callback
+    def _async_start_next(self) -> None:
+        """Start queued updates while below the tracker and rollout caps."""
+        waiting: deque[tuple[str, FirmwareRollout]] = deque()
+        while self._pending and len(self._active) < self.max_concurrent:
+            scooter_id, rollout = self._pending.popleft()
+            if rollout.active >= rollout.max_concurrent:
+                waiting.append((scooter_id, rollout))
+                continue
+            rollout.active += 1
+            self._rollouts[scooter_id] = rollout
+            self._active[scooter_id] = self.hass.async_create_background_task(
+                self._async_run(scooter_id),
+                f"sunshine firmware update {scooter_id}",
+            )
+        waiting.extend(self._pending)
+        self._pending = waiting
+
+    async def _async_run(self, scooter_id: str) -> None:
+        """Start an update and poll the scooter until it has finished."""
+        state = self.states[scooter_id]
+        try:
+            scooter = await self.api.get_scooter(scooter_id, PRIORITY_TARGETED)
+            state.from_version = firmware_installed_version(scooter)
+
+            await self.api.update_firmware(scooter_id)
+            state.status = FIRMWARE_STATUS_UPDATING
+            self._listeners.async_notify(scooter_id)
+
+            deadline = time.monotonic() + FIRMWARE_UPDATE_TIMEOUT
+            while state.status == FIRMWARE_STATUS_UPDATING:
+                await asyncio.sleep(_poll_interval(state.progress))
+
+                if time.monotonic() > deadline:
+                    _LOGGER.error("Firmware update of scooter %s timed out", scooter_id)
+                    state.status = FIRMWARE_STATUS_FAILED
+                    break
+
+                try:
+                    scooter = await self.api.get_scooter(scooter_id, PRIORITY_TARGETED)
+                except Exception as err:
+                    _LOGGER.debug(
+                        "Failed to poll firmware progress of scooter %s: %s",
+                        scooter_id,
+                        err,
+                    )
+                    continue
+
+                self._update_state(state, scooter)
+                self._listeners.async_notify(scooter_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _LOGGER.error("Failed to update firmware of scooter %s: %s", scooter_id, err)
+            state.status = FIRMWARE_STATUS_FAILED
+        finally:
+            self._active.pop(scooter_id, None)
+            if (rollout := self._rollouts.pop(scooter_id, None)) is not None:
+                rollout.active -= 1
+            self._listeners.async_notify(scooter_id)
+            self._async_start_next()
+
+    @staticmethod
+    def _update_state(state: FirmwareUpdateState, scooter: dict[str, Any]) -> None:
+        """Update the tracked state from a freshly fetched scooter."""
+        if (progress := firmware_progress(scooter)) is not None:
+            state.progress = progress
+
+        status = firmware_status(scooter)
+        if status in (FIRMWARE_STATUS_COMPLETED, FIRMWARE_STATUS_FAILED):
+            state.status = status
+        elif status is None and (
+            state.progress == 100
+            or firmware_installed_version(scooter) != state.from_version
+        ):
+            state.status = FIRMWARE_STATUS_COMPLETED
+
+    async def async_shutdown(self) -> None:
+        """Cancel all queued and running updates."""
+        self._pending.clear()
+        tasks = list(self._active.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._active.clear()
+        self._rollouts.clear()
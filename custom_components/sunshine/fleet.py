@@ -0,0 +1,182 @@
+"""Fleet aggregates for Sunshine Scooter integration."""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import UNLOCKED_STATES
+from .coordinator import SunshineDataUpdateCoordinator
+from .listeners import KeyedListeners
+
+_LOGGER = logging.getLogger(__name__)
+
+# Scooter fields the aggregates are computed from
+FLEET_FIELDS = ("state", "batteries", "odometer", "speed")
+
+AGGREGATE_SCOOTERS = "scooters"
+AGGREGATE_STATES = "states"
+AGGREGATE_LOCKED = "locked"
+AGGREGATE_UNLOCKED = "unlocked"
+AGGREGATE_AVERAGE_BATTERY = "average_battery"
+AGGREGATE_MINIMUM_BATTERY = "minimum_battery"
+AGGREGATE_TOTAL_ODOMETER = "total_odometer"
+AGGREGATE_MOVING = "moving"
+
+
+def _number(value: Any) -> float | None:
+    """Return a value as a number, or None if it is not one."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
+class ScooterContribution:
+    """What a single scooter adds to the fleet aggregates."""
+
+    state: str | None
+    battery: float | None
+    odometer: float | None
+    moving: bool
+
+    @classmethod
+    def from_scooter(cls, scooter: dict[str, Any]) -> ScooterContribution:
+        """Return the contribution of a scooter document."""
+        batteries = scooter.get("batteries") or {}
+        battery0 = batteries.get("battery0") or {}
+        speed = _number(scooter.get("speed"))
+        return cls(
+            state=scooter.get("state"),
+            battery=_number(battery0.get("level")),
+            odometer=_number(scooter.get("odometer")),
+            moving=speed is not None and speed > 0,
+        )
+
+
+class SunshineFleetAggregator:
+    """Keep fleet-wide aggregates up to date from per-scooter changes.
+
+    Each refresh only the contributions of scooters that changed or
+    disappeared are taken out of the running totals and added back, so the
+    work follows the number of changed scooters rather than the fleet size.
+    Listeners of an aggregate are only called when its value changed.
+    """
+
+    def __init__(self, coordinator: SunshineDataUpdateCoordinator) -> None:
+        """Initialize the aggregator from the current coordinator data."""
+        self.coordinator = coordinator
+        self._contributions: dict[str, ScooterContribution] = {}
+        self._states: Counter[str] = Counter()
+        self._battery_levels: Counter[float] = Counter()
+        self._battery_sum = 0.0
+        self._odometer_sum = 0.0
+        self._moving = 0
+        self._listeners: KeyedListeners[str] = KeyedListeners()
+
+        data = coordinator.data or {}
+        self._apply(data, data.keys(), ())
+        self._values = self._compute()
+
+    @callback
+    def async_add_listener(
+        self, aggregate: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for changes of a single aggregate."""
+        return self._listeners.async_add(aggregate, update_callback)
+
+    def value(self, aggregate: str) -> Any:
+        """Return the current value of an aggregate."""
+        return self._values[aggregate]
+
+    @callback
+    def async_handle_coordinator_update(self) -> None:
+        """Apply the scooters changed by the latest refresh."""
+        changed = self.coordinator.changed_scooters
+        removed = self.coordinator.removed_scooters
+        if not changed and not removed:
+            return
+
+        self._apply(self.coordinator.data, changed, removed)
+
+        values = self._compute()
+        updated = [key for key, value in values.items() if self._values[key] != value]
+        self._values = values
+        for aggregate in updated:
+            self._listeners.async_notify(aggregate)
+
+    def _apply(
+        self,
+        data: dict[str, dict[str, Any]],
+        changed: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Replace the contributions of changed and removed scooters."""
+        for scooter_id in removed:
+            if (old := self._contributions.pop(scooter_id, None)) is not None:
+                self._remove(old)
+
+        for scooter_id in changed:
+            new = ScooterContribution.from_scooter(data[scooter_id])
+            old = self._contributions.get(scooter_id)
+            if new == old:
+                continue
+            if old is not None:
+                self._remove(old)
+            self._contributions[scooter_id] = new
+            self._add(new)
+
+    def _add(self, contribution: ScooterContribution) -> None:
+        """Add a scooter to the totals."""
+        if contribution.state is not None:
+            self._states[contribution.state] += 1
+        if contribution.battery is not None:
+            self._battery_levels[contribution.battery] += 1
+            self._battery_sum += contribution.battery
+        if contribution.odometer is not None:
+            self._odometer_sum += contribution.odometer
+        self._moving += contribution.moving
+
+    def _remove(self, contribution: ScooterContribution) -> None:
+        """Take a scooter out of the totals."""
+        if contribution.state is not None:
+            self._states[contribution.state] -= 1
+            if not self._states[contribution.state]:
+                del self._states[contribution.state]
+        if contribution.battery is not None:
+            self._battery_levels[contribution.battery] -= 1
+            if not self._battery_levels[contribution.battery]:
+                del self._battery_levels[contribution.battery]
+            self._battery_sum -= contribution.battery
+        if contribution.odometer is not None:
+            self._odometer_sum -= contribution.odometer
+        self._moving -= contribution.moving
+
+    def _compute(self) -> dict[str, Any]:
+        """Return the values of all aggregates."""
+        # Battery levels are a handful of distinct values, whatever the fleet size
+        batteries = self._battery_levels.total()
+        unlocked = sum(self._states[state] for state in UNLOCKED_STATES)
+        return {
+            AGGREGATE_SCOOTERS: len(self._contributions),
+            AGGREGATE_STATES: dict(self._states),
+            AGGREGATE_LOCKED: self._states.total() - unlocked,
+            AGGREGATE_UNLOCKED: unlocked,
+            AGGREGATE_AVERAGE_BATTERY: (
+                round(self._battery_sum / batteries, 1) if batteries else None
+            ),
+            AGGREGATE_MINIMUM_BATTERY: (
+                min(self._battery_levels) if self._battery_levels else None
+            ),
+            AGGREGATE_TOTAL_ODOMETER: round(self._odometer_sum / 1000, 1),
+            AGGREGATE_MOVING: self._moving,
+        }
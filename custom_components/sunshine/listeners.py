@@ -0,0 +1,42 @@
+"""Keyed listeners for Sunshine Scooter integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+_KeyT = TypeVar("_KeyT", bound=Hashable)
+
+
+class KeyedListeners(Generic[_KeyT]):
+    """Callbacks registered per key, such as a scooter or a command type.
+
+    Notifying a key only calls the callbacks of that key, so an update of
+    one scooter does not wake the entities of every other scooter. Keys
+    without listeners are dropped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the listeners."""
+        self._listeners: dict[_KeyT, list[CALLBACK_TYPE]] = {}
+
+    @callback
+    def async_add(self, key: _KeyT, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for changes of a key, return a function removing the listener."""
+        listeners = self._listeners.setdefault(key, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners and self._listeners.get(key) is listeners:
+                del self._listeners[key]
+
+        return remove_listener
+
+    @callback
+    def async_notify(self, key: _KeyT) -> None:
+        """Call the listeners of a key."""
+        for update_callback in list(self._listeners.get(key, ())):
+            update_callback()
@@ -0,0 +1,138 @@
+"""On-demand refresh profiling for Sunshine Scooter integration."""
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_PROFILE_COMPLETE = "sunshine_profile_complete"
+
+TRACEMALLOC_FRAMES = 10
+STATS_LIMIT = 50  # functions
+ALLOCATIONS_LIMIT = 30  # lines
+SUMMARY_LIMIT = 5  # functions
+
+
+class RefreshProfiler:
+    """Profile CPU time and allocations of the next coordinator refreshes.
+
+    A cycle covers a whole coordinator refresh, from fetching until the
+    listeners have written their state, so API calls, JSON decoding and
+    entity property evaluation are all included. Failed refreshes count as
+    cycles too. Everything else running on the event loop during a cycle is
+    profiled as well.
+    """
+
+    def __init__(self, hass: HomeAssistant, cycles: int, path: str) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self.cycles = cycles
+        self.path = path
+        self.completed = 0
+        self.refresh_times: list[float] = []
+        self._profile = cProfile.Profile()
+        self._started_tracemalloc = False
+        self._cycle_started: float | None = None
+
+    @property
+    def done(self) -> bool:
+        """Return true once all cycles have been profiled."""
+        return self.completed >= self.cycles
+
+    def start_cycle(self) -> bool:
+        """Start profiling a refresh, return false if profiling is not possible."""
+        if self._cycle_started is not None:
+            return True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            # Another profiler is already active
+            _LOGGER.error("Cannot start profiler: %s", err)
+            self._stop_tracemalloc()
+            return False
+        self._cycle_started = time.perf_counter()
+        return True
+
+    def end_cycle(self) -> None:
+        """Stop profiling the current refresh."""
+        if self._cycle_started is None:
+            return
+        self._profile.disable()
+        self.refresh_times.append(time.perf_counter() - self._cycle_started)
+        self._cycle_started = None
+        self.completed += 1
+
+    def _stop_tracemalloc(self) -> None:
+        """Stop tracing allocations if this profiler started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def cancel(self) -> None:
+        """Stop profiling without writing results."""
+        if self._cycle_started is not None:
+            self._profile.disable()
+            self._cycle_started = None
+        self._stop_tracemalloc()
+
+    async def async_finish(self) -> dict[str, Any]:
+        """Write the results and fire a summary event."""
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        _, peak = tracemalloc.get_traced_memory()
+        self._stop_tracemalloc()
+
+        summary = await self.hass.async_add_executor_job(self._write, snapshot)
+        summary.update(
+            path=self.path,
+            cycles=self.completed,
+            refresh_times=[round(elapsed, 4) for elapsed in self.refresh_times],
+            peak_traced_memory=peak,
+        )
+        self.hass.bus.async_fire(EVENT_PROFILE_COMPLETE, summary)
+        _LOGGER.info("Profile of %d refreshes written to %s", self.completed, self.path)
+        return summary
+
+    def _write(self, snapshot: tracemalloc.Snapshot | None) -> dict[str, Any]:
+        """Write sorted statistics and allocation top lists to the result file."""
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(STATS_LIMIT)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(STATS_LIMIT)
+
+        top_functions = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][2],
+            reverse=True,
+        )[:SUMMARY_LIMIT]:
+            top_functions.append(
+                {
+                    "function": f"{filename}:{line}({function})",
+                    "calls": calls,
+                    "tottime": round(tottime, 4),
+                    "cumtime": round(cumtime, 4),
+                }
+            )
+
+        top_allocations = []
+        if snapshot is not None:
+            allocations = snapshot.statistics("lineno")[:ALLOCATIONS_LIMIT]
+            stream.write(f"\nTop {ALLOCATIONS_LIMIT} allocations by line\n\n")
+            stream.writelines(f"{statistic}\n" for statistic in allocations)
+            top_allocations = [str(statistic) for statistic in allocations[:SUMMARY_LIMIT]]
+
+        with open(self.path, "w", encoding="utf-8") as result:
+            result.write(stream.getvalue())
+
+        return {"top_functions": top_functions, "top_allocations": top_allocations}
@@ -0,0 +1,264 @@
+"""Record and replay Sunshine API traffic.
+
+Captures are NDJSON files with one request/response pair per line. A
+capture can be served back by a local replay server, so the integration
+can be load tested against real traffic without network access::
+
+    python -m custom_components.sunshine.replay capture.ndjson --scale 0.5
+
+Then configure the integration with ``http://localhost:8099`` as base URL.
+The server logs the bytes of every refresh cycle, before and after
+compression, and with ``--verbose`` of every request.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+import gzip
+import itertools
+import json
+import logging
+import time
+from typing import Any
+
+from aiohttp import hdrs, web
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REPLAY_PORT = 8099
+
+FLUSH_THRESHOLD = 50  # records
+
+SCRUB_TOKEN_KEYS = {"token", "access_token", "api_token", "refresh_token"}
+SCRUB_LOCATION_KEYS = {"lat", "lng"}
+
+
+def scrub(value: Any, locations: bool = True) -> Any:
+    """Return a copy of a JSON value with tokens and optionally locations removed."""
+    if isinstance(value, dict):
+        scrubbed = {}
+        for key, item in value.items():
+            if key in SCRUB_TOKEN_KEYS:
+                scrubbed[key] = "**REDACTED**"
+            elif locations and key in SCRUB_LOCATION_KEYS and item is not None:
+                scrubbed[key] = 0.0
+            else:
+                scrubbed[key] = scrub(item, locations)
+        return scrubbed
+    if isinstance(value, list):
+        return [scrub(item, locations) for item in value]
+    return value
+
+
+class TrafficRecorder:
+    """Record API request/response pairs with timing to an NDJSON file."""
+
+    def __init__(self, path: str, scrub_locations: bool = True) -> None:
+        """Initialize the recorder."""
+        self.path = path
+        self.scrub_locations = scrub_locations
+        self._started = time.monotonic()
+        self._buffer: list[str] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status: int,
+        elapsed: float,
+        request: dict[str, Any] | None,
+        response: Any,
+    ) -> None:
+        """Add a request/response pair to the capture."""
+        self._buffer.append(
+            json.dumps(
+                {
+                    "t": round(time.monotonic() - self._started - elapsed, 4),
+                    "method": method,
+                    "endpoint": endpoint,
+                    "request": scrub(request, self.scrub_locations),
+                    "status": status,
+                    "elapsed": round(elapsed, 4),
+                    "response": scrub(response, self.scrub_locations),
+                },
+                separators=(",", ":"),
+            )
+        )
+        if len(self._buffer) >= FLUSH_THRESHOLD and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.get_running_loop().create_task(self.async_flush())
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the capture file."""
+        with open(self.path, "a", encoding="utf-8") as capture:
+            capture.writelines(f"{line}\n" for line in lines)
+
+    async def async_flush(self) -> None:
+        """Write buffered records to the capture file."""
+        async with self._lock:
+            lines, self._buffer = self._buffer, []
+            if lines:
+                await asyncio.get_running_loop().run_in_executor(None, self._write, lines)
+
+    async def async_close(self) -> None:
+        """Write all remaining records."""
+        await self.async_flush()
+
+
+def load_capture(path: str) -> dict[tuple[str, str], list[dict[str, Any]]]:
+    """Load a capture file grouped by method and endpoint."""
+    records: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as capture:
+        for line in capture:
+            if line.strip():
+                record = json.loads(line)
+                records[(record["method"], record["endpoint"])].append(record)
+    return records
+
+
+def project(value: Any, fields: set[str]) -> Any:
+    """Return a document, or a list of documents, reduced to the given fields."""
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {key: item for key, item in value.items() if key in fields}
+    return value
+
+
+@dataclass
+class ByteCounter:
+    """Response bytes served, before and after compression."""
+
+    requests: int = 0
+    raw: int = 0
+    sent: int = 0
+
+    def add(self, raw: int, sent: int) -> None:
+        """Count a response."""
+        self.requests += 1
+        self.raw += raw
+        self.sent += sent
+
+    def __str__(self) -> str:
+        """Return a summary of the counted responses."""
+        return f"{self.requests} requests, {self.raw} bytes raw, {self.sent} bytes sent"
+
+
+REPLAY_BYTES = web.AppKey("bytes", ByteCounter)
+
+
+def create_replay_app(
+    records: dict[tuple[str, str], list[dict[str, Any]]],
+    latency_scale: float = 1.0,
+) -> web.Application:
+    """Create an app serving recorded responses with scaled latency.
+
+    Responses for the same method and endpoint are served in recorded order
+    and start over once exhausted. Like the real API, successful responses
+    honour a ``fields`` projection and are compressed when the client
+    accepts it.
+
+    Bytes are counted per request and per refresh cycle, which starts with
+    every request for the scooter list. The totals are in ``app[REPLAY_BYTES]``.
+    """
+    cycles = {key: itertools.cycle(entries) for key, entries in records.items()}
+    totals = ByteCounter()
+    cycle = ByteCounter()
+    cycle_number = 0
+
+    def log_cycle() -> None:
+        if cycle.requests:
+            _LOGGER.info("Cycle %d: %s", cycle_number, cycle)
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        nonlocal cycle, cycle_number
+        endpoint = request.path.removeprefix("/api/v1")
+        if (entries := cycles.get((request.method, endpoint))) is None:
+            raise web.HTTPNotFound
+
+        if request.method == "GET" and endpoint == "/scooters":
+            log_cycle()
+            cycle = ByteCounter()
+            cycle_number += 1
+
+        record = next(entries)
+        if latency_scale > 0:
+            await asyncio.sleep(record["elapsed"] * latency_scale)
+
+        body = record["response"]
+        if (fields := request.query.get("fields")) and record["status"] < 400:
+            body = project(body, set(fields.split(",")))
+
+        raw = json.dumps(body).encode()
+        sent = raw
+        headers = {}
+        if "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
+            sent = gzip.compress(raw)
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+
+        totals.add(len(raw), len(sent))
+        cycle.add(len(raw), len(sent))
+        _LOGGER.debug(
+            "%s %s: %d bytes raw, %d bytes sent",
+            request.method,
+            request.path_qs,
+            len(raw),
+            len(sent),
+        )
+
+        return web.Response(
+            body=sent,
+            status=record["status"],
+            content_type="application/json",
+            headers=headers,
+        )
+
+    async def log_totals(app: web.Application) -> None:
+        log_cycle()
+        _LOGGER.info("Total: %s", totals)
+
+    app = web.Application()
+    app[REPLAY_BYTES] = totals
+    app.router.add_route("*", "/api/v1/{tail:.*}", handle)
+    app.on_cleanup.append(log_totals)
+    return app
+
+
+def main() -> None:
+    """Run the replay server."""
+    parser = argparse.ArgumentParser(description="Replay captured Sunshine API traffic")
+    parser.add_argument("capture", help="NDJSON capture file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_REPLAY_PORT)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="latency multiplier, 0 serves responses immediately",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="log the bytes of every request"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.verbose:
+        _LOGGER.setLevel(logging.DEBUG)
+    records = load_capture(args.capture)
+    _LOGGER.info(
+        "Replaying %d requests on %d endpoints",
+        sum(len(entries) for entries in records.values()),
+        len(records),
+    )
+    web.run_app(
+        create_replay_app(records, args.scale), host=args.host, port=args.port
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .command_queue import SunshineCommandQueue
 from .const import (
     BLINKER_BOTH,
     BLINKER_LEFT,
     BLINKER_OFF,
     BLINKER_RIGHT,
+    CATEGORY_CONTROLS,
+    CATEGORY_SOUNDS,
     DOMAIN,
     SOUND_ALARM,
     SOUND_CHIRP,
@@ -31,6 +34,8 @@ class SunshineSelectEntityDescription(SelectEntityDescription):
     
     api_method: str | None = None
     api_param_key: str | None = None
+    category: str = CATEGORY_CONTROLS
+    fields: tuple[str, ...] = ()
 
 
 SELECT_TYPES: list[SunshineSelectEntityDescription] = [
@@ -41,6 +46,8 @@ SELECT_TYPES: list[SunshineSelectEntityDescription] = [
         options=[BLINKER_OFF, BLINKER_LEFT, BLINKER_RIGHT, BLINKER_BOTH],
         api_method="blinkers",
         api_param_key="state",
+        category=CATEGORY_CONTROLS,
+        fields=("blinkers",),
     ),
     SunshineSelectEntityDescription(
         key="sound",
@@ -49,6 +56,7 @@ SELECT_TYPES: list[SunshineSelectEntityDescription] = [
         options=[SOUND_ALARM, SOUND_CHIRP, SOUND_FIND_ME],
         api_method="play_sound",
         api_param_key="sound",
+        category=CATEGORY_SOUNDS,
     ),
 ]
 
@@ -62,15 +70,22 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     api = data["api"]
     coordinator = data["coordinator"]
+    command_queue = data["command_queue"]
+    descriptions = [
+        description
+        for description in SELECT_TYPES
+        if description.category in data["categories"]
+    ]
     
     entities: list[SunshineSelect] = []
     
     for scooter_id in coordinator.data:
-        for description in SELECT_TYPES:
+        for description in descriptions:
             entities.append(
-                SunshineSelect(api, coordinator, scooter_id, description)
+                SunshineSelect(api, command_queue, coordinator, scooter_id, description)
             )
     
+    data["unique_ids"].update(entity.unique_id for entity in entities)
     async_add_entities(entities)
 
 
@@ -82,6 +97,7 @@ class SunshineSelect(SunshineEntity, SelectEntity):
     def __init__(
         self,
         api,
+        command_queue: SunshineCommandQueue,
         coordinator: SunshineDataUpdateCoordinator,
         scooter_id: str,
         description: SunshineSelectEntityDescription,
@@ -89,11 +105,13 @@ class SunshineSelect(SunshineEntity, SelectEntity):
         """Initialize the select entity."""
         super().__init__(coordinator, scooter_id)
         self.api = api
+        self.command_queue = command_queue
         self.entity_description = description
         
         self._attr_unique_id = f"{scooter_id}_{description.key}"
         self._attr_options = description.options
         self._attr_current_option = description.options[0]
+        self._fields = description.fields
     
     @property
     def current_option(self) -> str | None:
@@ -105,16 +123,8 @@ class SunshineSelect(SunshineEntity, SelectEntity):
     
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        try:
-            api_method = getattr(self.api, self.entity_description.api_method)
-            await api_method(self.scooter_id, option)
-            self._attr_current_option = option
-            await self.coordinator.async_request_refresh()
-        except Exception as err:
-            _LOGGER.error(
-                "Failed to set %s to %s for scooter %s: %s",
-                self.entity_description.key,
-                option,
-                self.scooter_id,
-                err
-            )
\ No newline at end of file
+        self.command_queue.async_send(
+            self.scooter_id, self.entity_description.api_method, option
+        )
+        self._attr_current_option = option
+        self.async_write_ha_state()
\ No newline at end of file
@@ -1,20 +1,55 @@
 """Sensor platform for Sunshine Scooter integration."""
 from __future__ import annotations
 
+from dataclasses import dataclass
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .command_queue import SunshineCommandQueue
+from .commands import COMMAND_CONDITIONS, SunshineCommandTracker
+from .const import (
+    CATEGORY_DIAGNOSTICS,
+    CONF_BATTERY_DEADBAND,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_SPEED_DEADBAND,
+    DEFAULT_BATTERY_DEADBAND,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_SPEED_DEADBAND,
+    DOMAIN,
+)
 from .coordinator import SunshineDataUpdateCoordinator
-from .entity import SunshineEntity
+from .entity import SunshineEntity, SunshineHubEntity
+from .filters import StateWriteFilter
+from .fleet import (
+    AGGREGATE_AVERAGE_BATTERY,
+    AGGREGATE_LOCKED,
+    AGGREGATE_MINIMUM_BATTERY,
+    AGGREGATE_MOVING,
+    AGGREGATE_SCOOTERS,
+    AGGREGATE_STATES,
+    AGGREGATE_TOTAL_ODOMETER,
+    AGGREGATE_UNLOCKED,
+    SunshineFleetAggregator,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Scooter fields read by sensors whose key is not a field of its own
+SENSOR_FIELDS: dict[str, tuple[str, ...]] = {
+    "battery_level": ("batteries",),
+}
+
 SENSOR_TYPES: list[SensorEntityDescription] = [
     SensorEntityDescription(
         key="battery_level",
@@ -42,6 +77,63 @@ SENSOR_TYPES: list[SensorEntityDescription] = [
 ]
 
 
+@dataclass(frozen=True, kw_only=True)
+class SunshineFleetSensorEntityDescription(SensorEntityDescription):
+    """Describes Sunshine fleet aggregate sensor entity."""
+    
+    attributes_key: str | None = None
+
+
+FLEET_SENSOR_TYPES: list[SunshineFleetSensorEntityDescription] = [
+    SunshineFleetSensorEntityDescription(
+        key=AGGREGATE_SCOOTERS,
+        name="Scooters",
+        icon="mdi:scooter",
+        state_class=SensorStateClass.MEASUREMENT,
+        attributes_key=AGGREGATE_STATES,
+    ),
+    SunshineFleetSensorEntityDescription(
+        key=AGGREGATE_LOCKED,
+        name="Locked scooters",
+        icon="mdi:lock",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SunshineFleetSensorEntityDescription(
+        key=AGGREGATE_UNLOCKED,
+        name="Unlocked scooters",
+        icon="mdi:lock-open-variant",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SunshineFleetSensorEntityDescription(
+        key=AGGREGATE_MOVING,
+        name="Moving scooters",
+        icon="mdi:speedometer",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SunshineFleetSensorEntityDescription(
+        key=AGGREGATE_AVERAGE_BATTERY,
+        name="Average battery level",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SunshineFleetSensorEntityDescription(
+        key=AGGREGATE_MINIMUM_BATTERY,
+        name="Minimum battery level",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SunshineFleetSensorEntityDescription(
+        key=AGGREGATE_TOTAL_ODOMETER,
+        name="Total odometer",
+        native_unit_of_measurement="km",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL,
+    ),
+]
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -51,15 +143,52 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     api = data["api"]
     coordinator = data["coordinator"]
+    options = config_entry.options
+    
+    # Numeric sensors only write changes of at least this size
+    deadbands = {
+        "battery_level": options.get(CONF_BATTERY_DEADBAND, DEFAULT_BATTERY_DEADBAND),
+        "speed": options.get(CONF_SPEED_DEADBAND, DEFAULT_SPEED_DEADBAND),
+        "odometer": 0,
+    }
+    min_interval = options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL)
     
-    entities: list[SunshineSensor] = []
+    entities: list[SensorEntity] = []
     
     for scooter_id in coordinator.data:
         for description in SENSOR_TYPES:
+            write_filter = None
+            if description.key in deadbands:
+                write_filter = StateWriteFilter(
+                    description.key,
+                    min_delta=deadbands[description.key],
+                    min_interval=min_interval,
+                )
             entities.append(
-                SunshineSensor(api, coordinator, scooter_id, description)
+                SunshineSensor(api, coordinator, scooter_id, description, write_filter)
             )
     
+    if CATEGORY_DIAGNOSTICS in data["categories"]:
+        for scooter_id in coordinator.data:
+            entities.append(
+                SunshineCommandQueueSensor(data["command_queue"], coordinator, scooter_id)
+            )
+        
+        for command in COMMAND_CONDITIONS:
+            entities.append(
+                SunshineCommandLatencySensor(data["commands"], config_entry.entry_id, command)
+            )
+            entities.append(
+                SunshineCommandFailureSensor(data["commands"], config_entry.entry_id, command)
+            )
+    
+    if (fleet := data["fleet"]) is not None:
+        for description in FLEET_SENSOR_TYPES:
+            entities.append(
+                SunshineFleetSensor(fleet, config_entry.entry_id, description)
+            )
+    
+    data["unique_ids"].update(entity.unique_id for entity in entities)
     async_add_entities(entities)
 
 
@@ -72,12 +201,19 @@ class SunshineSensor(SunshineEntity, SensorEntity):
         coordinator: SunshineDataUpdateCoordinator,
         scooter_id: str,
         description: SensorEntityDescription,
+        write_filter: StateWriteFilter | None = None,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, scooter_id)
         self.api = api
         self.entity_description = description
         self._attr_unique_id = f"{scooter_id}_{description.key}"
+        self._write_filter = write_filter
+        self._fields = SENSOR_FIELDS.get(description.key, (description.key,))
+    
+    def _write_filter_value(self) -> Any:
+        """Return the value compared by the write filter."""
+        return self.native_value
     
     @property
     def native_value(self) -> Any:
@@ -102,4 +238,166 @@ class SunshineSensor(SunshineEntity, SensorEntity):
                     return None
             
             return value
-        return None
\ No newline at end of file
+        return None
+
+
+class SunshineCommandQueueSensor(SunshineEntity, SensorEntity):
+    """Number of commands waiting to be delivered to a scooter."""
+    
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:tray-full"
+    
+    def __init__(
+        self,
+        command_queue: SunshineCommandQueue,
+        coordinator: SunshineDataUpdateCoordinator,
+        scooter_id: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, scooter_id)
+        self.command_queue = command_queue
+        self._attr_unique_id = f"{scooter_id}_command_queue"
+        self._attr_name = "Queued Commands"
+    
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the command queue of this scooter."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.command_queue.async_add_listener(self.scooter_id, self.async_write_ha_state)
+        )
+    
+    @property
+    def native_value(self) -> int:
+        """Return the number of queued commands."""
+        return self.command_queue.depth(self.scooter_id)
+
+
+class SunshineCommandSensor(SunshineHubEntity, SensorEntity):
+    """Base class for command confirmation sensors of the fleet hub."""
+    
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    
+    def __init__(
+        self,
+        commands: SunshineCommandTracker,
+        entry_id: str,
+        command: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry_id)
+        self.commands = commands
+        self.command = command
+    
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to confirmation statistics of the command."""
+        self.async_on_remove(
+            self.commands.async_add_listener(self.command, self._handle_stats_update)
+        )
+    
+    @callback
+    def _handle_stats_update(self) -> None:
+        """Handle updated confirmation statistics."""
+        self.async_write_ha_state()
+
+
+class SunshineCommandLatencySensor(SunshineCommandSensor):
+    """Time scooters took to act on the latest command of a type."""
+    
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "s"
+    _attr_icon = "mdi:timer-check-outline"
+    
+    def __init__(
+        self,
+        commands: SunshineCommandTracker,
+        entry_id: str,
+        command: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(commands, entry_id, command)
+        self._attr_unique_id = f"{entry_id}_{command}_confirm_time"
+        self._attr_name = f"{command.replace('_', ' ').capitalize()} confirm time"
+    
+    @property
+    def native_value(self) -> float | None:
+        """Return the time to confirm of the latest confirmed command."""
+        if (latency := self.commands.stats[self.command].last_latency) is not None:
+            return round(latency, 1)
+        return None
+    
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the confirmation statistics."""
+        stats = self.commands.stats[self.command]
+        mean_latency = stats.mean_latency
+        return {
+            "confirmed": stats.confirmed,
+            "mean": round(mean_latency, 1) if mean_latency is not None else None,
+        }
+
+
+class SunshineCommandFailureSensor(SunshineCommandSensor):
+    """Number of commands of a type that failed or were never confirmed."""
+    
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:alert-circle-outline"
+    
+    def __init__(
+        self,
+        commands: SunshineCommandTracker,
+        entry_id: str,
+        command: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(commands, entry_id, command)
+        self._attr_unique_id = f"{entry_id}_{command}_failures"
+        self._attr_name = f"{command.replace('_', ' ').capitalize()} failures"
+    
+    @property
+    def native_value(self) -> int:
+        """Return the number of failed commands."""
+        return self.commands.stats[self.command].failed
+
+
+class SunshineFleetSensor(SunshineHubEntity, SensorEntity):
+    """Fleet-wide aggregate of the fleet hub."""
+    
+    entity_description: SunshineFleetSensorEntityDescription
+    
+    def __init__(
+        self,
+        fleet: SunshineFleetAggregator,
+        entry_id: str,
+        description: SunshineFleetSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry_id)
+        self.fleet = fleet
+        self.entity_description = description
+        self._attr_unique_id = f"{entry_id}_fleet_{description.key}"
+    
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of the aggregate."""
+        self.async_on_remove(
+            self.fleet.async_add_listener(
+                self.entity_description.key, self.async_write_ha_state
+            )
+        )
+        if attributes_key := self.entity_description.attributes_key:
+            self.async_on_remove(
+                self.fleet.async_add_listener(attributes_key, self.async_write_ha_state)
+            )
+    
+    @property
+    def native_value(self) -> Any:
+        """Return the value of the aggregate."""
+        return self.fleet.value(self.entity_description.key)
+    
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the breakdown of the aggregate."""
+        if attributes_key := self.entity_description.attributes_key:
+            return self.fleet.value(attributes_key)
+        return None
@@ -0,0 +1,166 @@
+"""HTTP session management for Sunshine Scooter integration."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+
+CONNECT_TIMEOUT = 10  # seconds
+READ_TIMEOUT = 20  # seconds
+REQUEST_TIMEOUT = 60  # seconds
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 30  # seconds
+
+try:
+    import brotli  # noqa: F401
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+    else:
+        ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    ACCEPT_ENCODING = "gzip, deflate, br"
+
+
+@dataclass
+class ConnectionStats:
+    """Connection pool statistics of a session."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    pool_waits: int = 0
+    pool_wait_total: float = 0.0
+    pool_wait_max: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class SunshineSession:
+    """The client session of a config entry, with its own connection pool."""
+
+    session: aiohttp.ClientSession
+    stats: ConnectionStats
+    limit: int
+    remove_close_listener: CALLBACK_TYPE | None = field(default=None, repr=False)
+
+
+def _create_trace_config(stats: ConnectionStats) -> aiohttp.TraceConfig:
+    """Create a trace config that collects connection pool statistics."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        stats.requests += 1
+
+    async def on_connection_queued_start(
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionQueuedStartParams,
+    ) -> None:
+        context.queued_at = time.monotonic()
+
+    async def on_connection_queued_end(
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionQueuedEndParams,
+    ) -> None:
+        wait = time.monotonic() - context.queued_at
+        stats.pool_waits += 1
+        stats.pool_wait_total += wait
+        stats.pool_wait_max = max(stats.pool_wait_max, wait)
+
+    async def on_connection_create_end(
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        stats.connections_created += 1
+
+    async def on_connection_reuseconn(
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        stats.connections_reused += 1
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(on_connection_queued_end)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace_config
+
+
+@callback
+def async_acquire_session(
+    hass: HomeAssistant, entry_id: str, limit: int
+) -> SunshineSession:
+    """Create the session of a config entry.
+
+    Every entry gets its own connection pool sized to its own limit, so
+    entries using the same base URL never wait for each other's connections.
+    """
+    sessions: dict[str, SunshineSession] = hass.data.setdefault(DATA_SESSIONS, {})
+
+    stats = ConnectionStats()
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=get_default_context(),
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=REQUEST_TIMEOUT,
+            sock_connect=CONNECT_TIMEOUT,
+            sock_read=READ_TIMEOUT,
+        ),
+        headers={aiohttp.hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING},
+        trace_configs=[_create_trace_config(stats)],
+    )
+    entry_session = sessions[entry_id] = SunshineSession(session, stats, limit)
+
+    async def _async_close_session(event: Event) -> None:
+        entry_session.remove_close_listener = None
+        await session.close()
+
+    entry_session.remove_close_listener = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_CLOSE, _async_close_session
+    )
+    return entry_session
+
+
+async def async_release_session(hass: HomeAssistant, entry_id: str) -> None:
+    """Close the session of a config entry."""
+    sessions: dict[str, SunshineSession] = hass.data.get(DATA_SESSIONS, {})
+    if (entry_session := sessions.pop(entry_id, None)) is None:
+        return
+
+    if entry_session.remove_close_listener is not None:
+        entry_session.remove_close_listener()
+    await entry_session.session.close()
@@ -9,7 +9,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .command_queue import SunshineCommandQueue
+from .const import DOMAIN, UNLOCKED_STATES
 from .coordinator import SunshineDataUpdateCoordinator
 from .entity import SunshineEntity
 
@@ -25,25 +26,35 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     api = data["api"]
     coordinator = data["coordinator"]
+    command_queue = data["command_queue"]
     
     entities: list[SunshineLockSwitch] = []
     
     for scooter_id in coordinator.data:
-        entities.append(SunshineLockSwitch(api, coordinator, scooter_id))
+        entities.append(SunshineLockSwitch(api, command_queue, coordinator, scooter_id))
     
+    data["unique_ids"].update(entity.unique_id for entity in entities)
     async_add_entities(entities)
 
 
 class SunshineLockSwitch(SunshineEntity, SwitchEntity):
     """Representation of a Sunshine Scooter lock switch."""
     
-    def __init__(self, api, coordinator: SunshineDataUpdateCoordinator, scooter_id: str) -> None:
+    def __init__(
+        self,
+        api,
+        command_queue: SunshineCommandQueue,
+        coordinator: SunshineDataUpdateCoordinator,
+        scooter_id: str,
+    ) -> None:
         """Initialize the switch."""
         super().__init__(coordinator, scooter_id)
         self.api = api
+        self.command_queue = command_queue
         self._attr_unique_id = f"{scooter_id}_lock"
         self._attr_icon = "mdi:lock"
         self._attr_name = "Lock"
+        self._fields = ("state",)
     
     @property
     def is_on(self) -> bool:
@@ -52,21 +63,13 @@ class SunshineLockSwitch(SunshineEntity, SwitchEntity):
             state = scooter_data.get("state")
             if state:
                 # Following the logic from the Rails model: unlocked if state is 'parked' or 'ready-to-drive'
-                return state not in ["parked", "ready-to-drive"]
+                return state not in UNLOCKED_STATES
         return True  # Default to locked if no data
     
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Lock the scooter."""
-        try:
-            await self.api.lock(self.scooter_id)
-            await self.coordinator.async_request_refresh()
-        except Exception as err:
-            _LOGGER.error("Failed to lock scooter %s: %s", self.scooter_id, err)
+        self.command_queue.async_send(self.scooter_id, "lock")
     
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Unlock the scooter."""
-        try:
-            await self.api.unlock(self.scooter_id)
-            await self.coordinator.async_request_refresh()
-        except Exception as err:
-            _LOGGER.error("Failed to unlock scooter %s: %s", self.scooter_id, err)
\ No newline at end of file
+        self.command_queue.async_send(self.scooter_id, "unlock")
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""Update platform for Sunshine Scooter integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.update import (
+    UpdateDeviceClass,
+    UpdateEntity,
+    UpdateEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, FIRMWARE_STATUS_UPDATING
+from .coordinator import SunshineDataUpdateCoordinator
+from .entity import SunshineEntity
+from .firmware import (
+    SunshineFirmwareTracker,
+    firmware_installed_version,
+    firmware_latest_version,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Home Assistant before 2024.12 reads the update progress from in_progress
+LEGACY_PROGRESS = not hasattr(UpdateEntity, "update_percentage")
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Sunshine Scooter firmware update entities."""
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = data["coordinator"]
+    firmware = data["firmware"]
+
+    entities: list[SunshineFirmwareUpdate] = []
+
+    for scooter_id in coordinator.data:
+        entities.append(SunshineFirmwareUpdate(firmware, coordinator, scooter_id))
+
+    data["unique_ids"].update(entity.unique_id for entity in entities)
+    async_add_entities(entities)
+
+
+class SunshineFirmwareUpdate(SunshineEntity, UpdateEntity):
+    """Representation of a Sunshine Scooter firmware update."""
+
+    _attr_device_class = UpdateDeviceClass.FIRMWARE
+    _attr_supported_features = UpdateEntityFeature.INSTALL | UpdateEntityFeature.PROGRESS
+
+    def __init__(
+        self,
+        firmware: SunshineFirmwareTracker,
+        coordinator: SunshineDataUpdateCoordinator,
+        scooter_id: str,
+    ) -> None:
+        """Initialize the update entity."""
+        super().__init__(coordinator, scooter_id)
+        self.firmware = firmware
+        self._attr_unique_id = f"{scooter_id}_firmware"
+        self._attr_name = "Firmware"
+        self._fields = ("firmware_version", "latest_firmware_version")
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to firmware progress of this scooter."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.firmware.async_add_listener(self.scooter_id, self._handle_firmware_update)
+        )
+
+    @callback
+    def _handle_firmware_update(self) -> None:
+        """Handle firmware progress of this scooter."""
+        self.async_write_ha_state()
+
+    @property
+    def installed_version(self) -> str | None:
+        """Return the installed firmware version."""
+        if scooter_data := self.coordinator.data.get(self.scooter_id):
+            return firmware_installed_version(scooter_data)
+        return None
+
+    @property
+    def latest_version(self) -> str | None:
+        """Return the latest available firmware version."""
+        if scooter_data := self.coordinator.data.get(self.scooter_id):
+            return firmware_latest_version(scooter_data)
+        return None
+
+    @property
+    def in_progress(self) -> bool | int:
+        """Return true if a firmware update is queued or running."""
+        if not self.firmware.in_progress(self.scooter_id):
+            return False
+        if LEGACY_PROGRESS:
+            # A progress of 0 would read as not in progress
+            return self.update_percentage or True
+        return True
+
+    @property
+    def update_percentage(self) -> int | None:
+        """Return the progress of a running firmware update."""
+        if state := self.firmware.states.get(self.scooter_id):
+            if state.status == FIRMWARE_STATUS_UPDATING:
+                return state.progress
+        return None
+
+    async def async_install(
+        self, version: str | None, backup: bool, **kwargs: Any
+    ) -> None:
+        """Queue a firmware update of the scooter."""
+        self.firmware.async_schedule([self.scooter_id])
@@ -0,0 +1,225 @@
+"""Benchmark setup time and memory of the Sunshine integration for large fleets.
+
+Runs Home Assistant in-process against a local fake API serving a synthetic
+fleet, and sets up one config entry per run. Every configuration is measured
+in a fresh interpreter, once for time and once with tracemalloc::
+
+    python scripts/benchmark.py --scooters 300
+    python scripts/benchmark.py --scooters 300 --categories controls firmware
+
+Requires Home Assistant to be installed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from aiohttp import web
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+BENCHMARK_PORT = 8098
+
+ALL_CATEGORIES = ["controls", "diagnostics", "sounds", "firmware", "fleet"]
+
+
+def synthetic_fleet(scooters: int) -> dict[str, dict[str, Any]]:
+    """Return scooter documents shaped like the real API's."""
+    return {
+        f"scooter{index}": {
+            "id": f"scooter{index}",
+            "vin": f"VIN{index:06d}",
+            "model": "S1",
+            "state": "stand-by",
+            "online": True,
+            "speed": 0,
+            "odometer": 1000 * index,
+            "batteries": {"battery0": {"level": 20 + index % 80}},
+            "location": {"lat": 52.5 + index / 10000, "lng": 13.4},
+            "location_accuracy": 5,
+            "blinkers": "off",
+            "seatbox": "closed",
+            "firmware_version": "1.0",
+            "latest_firmware_version": "1.0",
+        }
+        for index in range(scooters)
+    }
+
+
+def create_fake_app(fleet: dict[str, dict[str, Any]]) -> web.Application:
+    """Create an app serving the fleet like the API, with field projection."""
+    from custom_components.sunshine.replay import project
+
+    def respond(request: web.Request, body: Any) -> web.Response:
+        if fields := request.query.get("fields"):
+            body = project(body, set(fields.split(",")))
+        return web.json_response(body)
+
+    async def scooters(request: web.Request) -> web.Response:
+        return respond(request, list(fleet.values()))
+
+    async def scooter(request: web.Request) -> web.Response:
+        if (document := fleet.get(request.match_info["id"])) is None:
+            raise web.HTTPNotFound
+        return respond(request, document)
+
+    app = web.Application()
+    app.router.add_get("/api/v1/scooters", scooters)
+    app.router.add_get("/api/v1/scooters/{id}", scooter)
+    return app
+
+
+async def async_create_hass(config_dir: str) -> Any:
+    """Return a minimal running Home Assistant instance."""
+    from homeassistant import core, loader
+    from homeassistant.config_entries import ConfigEntries
+    from homeassistant.helpers import (
+        area_registry as ar,
+        device_registry as dr,
+        entity as entity_helper,
+        entity_registry as er,
+        issue_registry as ir,
+        restore_state,
+        translation,
+    )
+
+    hass = core.HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    translation.async_setup(hass)
+    entity_helper.async_setup(hass)
+    try:
+        from homeassistant.helpers import floor_registry as fr
+    except ImportError:
+        pass
+    else:
+        await fr.async_load(hass)
+    await restore_state.async_load(hass)
+    await ar.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await ir.async_load(hass)
+    hass.set_state(core.CoreState.running)
+    return hass
+
+
+async def async_run(scooters: int, categories: list[str], memory: bool) -> dict[str, Any]:
+    """Set up one entry and return its measurements."""
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers import entity_registry as er
+
+    runner = web.AppRunner(create_fake_app(synthetic_fleet(scooters)))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", BENCHMARK_PORT).start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(
+            os.path.join(REPO, "custom_components"),
+            os.path.join(config_dir, "custom_components"),
+        )
+        hass = await async_create_hass(config_dir)
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain="sunshine",
+            title="Benchmark",
+            data={"token": "benchmark", "base_url": f"http://127.0.0.1:{BENCHMARK_PORT}"},
+            source="user",
+            options={"entity_categories": categories},
+        )
+
+        if memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - started
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        result: dict[str, Any] = {
+            "setup_seconds": round(elapsed, 3),
+            "entities": len(
+                er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+            ),
+            "states": len(hass.states.async_all()),
+        }
+        if memory:
+            result["memory_mib"] = round(current / 2**20, 1)
+            result["peak_memory_mib"] = round(peak / 2**20, 1)
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await hass.async_stop(force=True)
+
+    await runner.cleanup()
+    return result
+
+
+def measure(scooters: int, categories: list[str], memory: bool) -> dict[str, Any]:
+    """Run one measurement in a fresh interpreter."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--run",
+            "--scooters",
+            str(scooters),
+            "--categories",
+            *categories,
+            *(["--memory"] if memory else []),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    """Benchmark all categories against the given ones."""
+    parser = argparse.ArgumentParser(description="Benchmark Sunshine setup")
+    parser.add_argument("--scooters", type=int, default=300)
+    parser.add_argument(
+        "--categories",
+        nargs="*",
+        default=[],
+        help="categories compared with all categories, none by default",
+    )
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(asyncio.run(async_run(args.scooters, args.categories, args.memory))))
+        return
+
+    print(f"{args.scooters} scooters")
+    for name, categories in (
+        ("all categories", ALL_CATEGORIES),
+        (", ".join(args.categories) or "core only", args.categories),
+    ):
+        timing = measure(args.scooters, categories, memory=False)
+        allocations = measure(args.scooters, categories, memory=True)
+        print(
+            f"{name}: {timing['entities']} entities, {timing['states']} states, "
+            f"setup {timing['setup_seconds']} s, "
+            f"{allocations['memory_mib']} MiB retained, "
+            f"{allocations['peak_memory_mib']} MiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Tests for the Sunshine Scooter offline command queue."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+import time
+from typing import Any
+
+import aiohttp
+import pytest
+from yarl import URL
+
+from custom_components.sunshine import command_queue
+from custom_components.sunshine.command_queue import SunshineCommandQueue
+
+
+class FakeHass:
+    """Run background tasks on the running event loop."""
+
+    def async_create_background_task(
+        self, target: Coroutine[Any, Any, Any], name: str
+    ) -> asyncio.Task:
+        """Start a task."""
+        return asyncio.get_running_loop().create_task(target, name=name)
+
+
+class FakeStore:
+    """Keep stored data in memory."""
+
+    data: dict[str, Any] | None = None
+
+    def __init__(self, hass: FakeHass, version: int, key: str) -> None:
+        """Initialize the store."""
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the stored data."""
+        return FakeStore.data
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Store data."""
+        FakeStore.data = data
+
+    def async_delay_save(
+        self, data_func: Callable[[], dict[str, Any]], delay: float
+    ) -> None:
+        """Store data right away."""
+        FakeStore.data = data_func()
+
+
+class FakeCoordinator:
+    """Hold the scooters of the last refresh."""
+
+    def __init__(self, online: bool) -> None:
+        """Initialize the coordinator."""
+        self.data = {"s0": {"id": "s0", "online": online}}
+        self.refreshes = 0
+
+    async def async_request_refresh(self) -> None:
+        """Count refresh requests."""
+        self.refreshes += 1
+
+
+class FakeCommands:
+    """Record sent commands, raising the given error or waiting until released."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        """Initialize the fake command tracker."""
+        self.error = error
+        self.release: asyncio.Event | None = None
+        self.sent: list[str] = []
+        self.failures: list[str] = []
+
+    async def async_send(self, scooter_id: str, command: str, *args: Any) -> None:
+        """Send a command."""
+        self.sent.append(command)
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+
+    def async_record_failure(self, command: str) -> None:
+        """Record a command that could not be delivered."""
+        self.failures.append(command)
+
+
+def _create_queue(commands: FakeCommands, online: bool = True) -> SunshineCommandQueue:
+    """Return a queue for scooter s0."""
+    return SunshineCommandQueue(
+        FakeHass(), "entry", commands, FakeCoordinator(online)
+    )
+
+
+async def _async_settle() -> None:
+    """Let queue tasks run until they wait."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def fake_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Store queues in memory."""
+    monkeypatch.setattr(command_queue, "Store", FakeStore)
+    FakeStore.data = None
+
+
+def test_commands_sharing_a_key_coalesce() -> None:
+    """Test lock and unlock replace each other while the scooter is offline."""
+    queue = _create_queue(FakeCommands(), online=False)
+
+    queue.async_send("s0", "lock")
+    queue.async_send("s0", "blinkers", "left")
+    queue.async_send("s0", "unlock")
+
+    assert queue.depth("s0") == 2
+    assert [queued.command for queued in queue._queues["s0"].values()] == [
+        "blinkers",
+        "unlock",
+    ]
+
+
+def test_command_replaced_in_flight_is_still_sent() -> None:
+    """Test a command queued while an older one of its key is sent is kept."""
+
+    async def _async_test() -> FakeCommands:
+        commands = FakeCommands()
+        commands.release = asyncio.Event()
+        queue = _create_queue(commands)
+
+        queue.async_send("s0", "lock")
+        await _async_settle()
+        queue.async_send("s0", "unlock")
+        commands.release.set()
+        await _async_settle()
+
+        assert queue.depth("s0") == 0
+        assert queue.coordinator.refreshes == 1
+        return commands
+
+    assert asyncio.run(_async_test()).sent == ["lock", "unlock"]
+
+
+def test_expired_command_counts_one_failure() -> None:
+    """Test an expired command is dropped and counted as failed once."""
+    commands = FakeCommands()
+    queue = _create_queue(commands, online=False)
+    queue.async_send("s0", "lock")
+    queue._queues["s0"]["lock"].expires_at = time.time() - 1
+
+    queue.async_handle_coordinator_update()
+    queue.async_handle_coordinator_update()
+
+    assert queue.depth("s0") == 0
+    assert commands.failures == ["lock"]
+    assert commands.sent == []
+
+
+def test_transient_error_keeps_the_command() -> None:
+    """Test a command is kept for later when the scooter is unreachable."""
+
+    async def _async_test() -> None:
+        commands = FakeCommands(aiohttp.ClientConnectionError("unreachable"))
+        queue = _create_queue(commands)
+
+        queue.async_send("s0", "lock")
+        await _async_settle()
+
+        assert commands.sent == ["lock"]
+        assert queue.depth("s0") == 1
+        assert commands.failures == []
+        assert not queue._draining
+
+    asyncio.run(_async_test())
+
+
+def test_permanent_error_drops_the_command() -> None:
+    """Test a command rejected by the API is dropped and counted as failed."""
+
+    async def _async_test() -> None:
+        request_info = aiohttp.RequestInfo(
+            URL("http://localhost/api/v1/scooters/s0/lock"), "POST", {}
+        )
+        commands = FakeCommands(
+            aiohttp.ClientResponseError(request_info, (), status=422)
+        )
+        queue = _create_queue(commands)
+
+        queue.async_send("s0", "lock")
+        await _async_settle()
+
+        assert commands.sent == ["lock"]
+        assert queue.depth("s0") == 0
+        assert commands.failures == ["lock"]
+        assert queue.coordinator.refreshes == 0
+
+    asyncio.run(_async_test())
+
+
+def test_restore_skips_expired_commands() -> None:
+    """Test only commands that are still valid are restored after a restart."""
+    now = time.time()
+    FakeStore.data = {
+        "queues": {
+            "s0": {
+                "lock": {
+                    "command": "lock",
+                    "args": [],
+                    "queued_at": now - 10,
+                    "expires_at": now + 600,
+                },
+                "blinkers": {
+                    "command": "blinkers",
+                    "args": ["left"],
+                    "queued_at": now - 120,
+                    "expires_at": now - 60,
+                },
+            },
+            "s1": {
+                "open_seatbox": {
+                    "command": "open_seatbox",
+                    "args": [],
+                    "queued_at": now - 600,
+                    "expires_at": now - 300,
+                },
+            },
+        }
+    }
+    queue = _create_queue(FakeCommands(), online=False)
+
+    asyncio.run(queue.async_load())
+
+    assert queue.depth("s0") == 1
+    assert queue._queues["s0"]["lock"].command == "lock"
+    assert "s1" not in queue._queues
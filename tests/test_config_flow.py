@@ -0,0 +1,31 @@
+"""Tests for the Sunshine Scooter config flow."""
+from __future__ import annotations
+
+from custom_components.sunshine.config_flow import options_schema
+from custom_components.sunshine.const import (
+    CONF_CAPTURE_TRAFFIC,
+    CONF_ENTITY_CATEGORIES,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_SPEED_DEADBAND,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ENTITY_CATEGORIES,
+)
+
+
+def test_options_schema_defaults() -> None:
+    """Test the options schema builds and fills in defaults."""
+    options = options_schema({})({})
+
+    assert options[CONF_ENTITY_CATEGORIES] == ENTITY_CATEGORIES
+    assert options[CONF_MAX_CONCURRENT_REQUESTS] == DEFAULT_MAX_CONCURRENT_REQUESTS
+    assert options[CONF_CAPTURE_TRAFFIC] is False
+
+
+def test_options_schema_keeps_current_options() -> None:
+    """Test the current options are the defaults of the form."""
+    current = {CONF_SPEED_DEADBAND: 2.5, CONF_ENTITY_CATEGORIES: []}
+
+    options = options_schema(current)({})
+
+    assert options[CONF_SPEED_DEADBAND] == 2.5
+    assert options[CONF_ENTITY_CATEGORIES] == []
@@ -0,0 +1,91 @@
+"""Tests for the Sunshine Scooter state write filters."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.sunshine import filters
+from custom_components.sunshine.filters import StateWriteFilter, haversine_distance
+
+
+class FakeClock:
+    """Return a monotonic time that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the filters."""
+    fake_clock = FakeClock()
+    monkeypatch.setattr(filters.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+def test_haversine_distance() -> None:
+    """Test distances between known coordinates."""
+    assert haversine_distance(52.52, 13.405, 52.52, 13.405) == 0
+    # One degree of latitude is about 111.2 km
+    assert haversine_distance(0, 0, 1, 0) == pytest.approx(111195, rel=1e-3)
+    # Berlin to Paris
+    assert haversine_distance(52.52, 13.405, 48.8566, 2.3522) == pytest.approx(
+        877500, rel=1e-2
+    )
+
+
+def test_deadband_drops_small_changes(clock: FakeClock) -> None:
+    """Test changes below the deadband are dropped until they add up."""
+    write_filter = StateWriteFilter("battery", min_delta=1)
+
+    assert write_filter.should_write(50)
+    assert not write_filter.should_write(50.5)
+    assert not write_filter.should_write(49.2)
+    # Compared with the last written value, not the last dropped one
+    assert write_filter.should_write(51)
+    assert not write_filter.should_write(50.5)
+
+
+def test_none_and_non_numeric_changes_are_written(clock: FakeClock) -> None:
+    """Test changes the deadband cannot measure are always written."""
+    write_filter = StateWriteFilter("battery", min_delta=5)
+
+    assert write_filter.should_write(50)
+    assert write_filter.should_write(None)
+    assert write_filter.should_write(51)
+    assert write_filter.should_write("unknown")
+
+
+def test_distance_deadband(clock: FakeClock) -> None:
+    """Test positions are compared by their distance in meters."""
+    write_filter = StateWriteFilter("location", min_delta=10, distance=True)
+
+    assert write_filter.should_write((52.52, 13.405))
+    # About 5.6 m north
+    assert not write_filter.should_write((52.52005, 13.405))
+    # About 11.1 m north
+    assert write_filter.should_write((52.5201, 13.405))
+
+
+def test_rate_limit(clock: FakeClock) -> None:
+    """Test changes are written at most once per interval."""
+    write_filter = StateWriteFilter("speed", min_interval=30)
+
+    assert write_filter.should_write(10)
+    clock.now += 10
+    assert not write_filter.should_write(20)
+    clock.now += 20
+    assert write_filter.should_write(20)
+    clock.now += 29
+    assert not write_filter.should_write(30)
+
+    # A value written without the filter restarts the interval
+    write_filter.reset(40)
+    clock.now += 29
+    assert not write_filter.should_write(50)
+    clock.now += 1
+    assert write_filter.should_write(50)
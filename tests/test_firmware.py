@@ -0,0 +1,106 @@
+"""Tests for the Sunshine Scooter firmware tracker."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+import pytest
+
+from custom_components.sunshine import firmware
+from custom_components.sunshine.const import (
+    DEFAULT_FIRMWARE_MAX_CONCURRENT,
+    FIRMWARE_STATUS_COMPLETED,
+)
+from custom_components.sunshine.firmware import SunshineFirmwareTracker
+
+
+class FakeHass:
+    """Run background tasks on the running event loop."""
+
+    def async_create_background_task(
+        self, target: Coroutine[Any, Any, Any], name: str
+    ) -> asyncio.Task:
+        """Start a task."""
+        return asyncio.get_running_loop().create_task(target, name=name)
+
+
+class FakeFirmwareAPI:
+    """Finish updates once released, counting how many run at the same time."""
+
+    def __init__(self) -> None:
+        """Initialize the fake API."""
+        self.updating: set[str] = set()
+        self.peak = 0
+        self.released = False
+
+    async def get_scooter(self, scooter_id: str, priority: int) -> dict[str, Any]:
+        """Return the scooter, with the new version once released."""
+        if scooter_id in self.updating and self.released:
+            self.updating.discard(scooter_id)
+            return {"id": scooter_id, "firmware_version": "2.0"}
+        return {"id": scooter_id, "firmware_version": "1.0"}
+
+    async def update_firmware(self, scooter_id: str) -> None:
+        """Start an update."""
+        self.updating.add(scooter_id)
+        self.peak = max(self.peak, len(self.updating))
+
+
+async def _async_roll_out(
+    rollouts: list[tuple[list[str], int | None]],
+) -> tuple[FakeFirmwareAPI, SunshineFirmwareTracker]:
+    """Schedule rollouts and run them to completion."""
+    api = FakeFirmwareAPI()
+    tracker = SunshineFirmwareTracker(FakeHass(), api)
+    for scooter_ids, max_concurrent in rollouts:
+        tracker.async_schedule(scooter_ids, max_concurrent)
+
+    for _ in range(20):
+        await asyncio.sleep(0)
+    api.released = True
+    while tracker._active:
+        await asyncio.sleep(0)
+
+    await tracker.async_shutdown()
+    return api, tracker
+
+
+@pytest.fixture(autouse=True)
+def instant_polling(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Poll updating scooters without waiting."""
+    monkeypatch.setattr(firmware, "POLL_SCHEDULE", ((100, 0.0),))
+
+
+def test_separate_rollouts_share_the_cap() -> None:
+    """Test one-scooter rollouts, as from update entities, share the tracker cap."""
+    scooter_ids = [f"s{index}" for index in range(10)]
+
+    api, tracker = asyncio.run(
+        _async_roll_out([([scooter_id], None) for scooter_id in scooter_ids])
+    )
+
+    assert api.peak == DEFAULT_FIRMWARE_MAX_CONCURRENT
+    assert all(
+        tracker.states[scooter_id].status == FIRMWARE_STATUS_COMPLETED
+        for scooter_id in scooter_ids
+    )
+
+
+def test_max_concurrent_only_lowers_the_cap() -> None:
+    """Test a rollout can lower the cap for its scooters but not raise it."""
+    api, _ = asyncio.run(_async_roll_out([([f"s{index}" for index in range(5)], 1)]))
+    assert api.peak == 1
+
+    api, _ = asyncio.run(_async_roll_out([([f"s{index}" for index in range(8)], 10)]))
+    assert api.peak == DEFAULT_FIRMWARE_MAX_CONCURRENT
+
+
+def test_capped_rollout_does_not_hold_back_others() -> None:
+    """Test scooters of another rollout use the slots a capped rollout leaves free."""
+    api, tracker = asyncio.run(
+        _async_roll_out([(["a0", "a1", "a2"], 1), (["b0", "b1"], None)])
+    )
+
+    assert api.peak == DEFAULT_FIRMWARE_MAX_CONCURRENT
+    assert tracker.states["b1"].status == FIRMWARE_STATUS_COMPLETED
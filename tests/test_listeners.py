@@ -0,0 +1,36 @@
+"""Tests for the Sunshine Scooter keyed listeners."""
+from __future__ import annotations
+
+from custom_components.sunshine.listeners import KeyedListeners
+
+
+def test_notify_calls_only_listeners_of_the_key() -> None:
+    """Test notifying a key leaves the listeners of other keys alone."""
+    listeners: KeyedListeners[str] = KeyedListeners()
+    calls: list[str] = []
+    listeners.async_add("s0", lambda: calls.append("s0"))
+    listeners.async_add("s1", lambda: calls.append("s1"))
+
+    listeners.async_notify("s0")
+    listeners.async_notify("s2")
+
+    assert calls == ["s0"]
+
+
+def test_removing_the_last_listener_drops_the_key() -> None:
+    """Test keys without listeners are dropped, without touching a newer list."""
+    listeners: KeyedListeners[str] = KeyedListeners()
+    calls: list[str] = []
+    remove_first = listeners.async_add("s0", lambda: calls.append("first"))
+    remove_second = listeners.async_add("s0", lambda: calls.append("second"))
+
+    remove_first()
+    listeners.async_notify("s0")
+    assert calls == ["second"]
+
+    remove_second()
+    assert not listeners._listeners
+
+    listeners.async_add("s0", lambda: calls.append("third"))
+    listeners.async_notify("s0")
+    assert calls == ["second", "third"]
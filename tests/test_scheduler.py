@@ -0,0 +1,155 @@
+"""Tests for the Sunshine Scooter request scheduler."""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.sunshine.api import RequestScheduler
+from custom_components.sunshine.const import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_TARGETED,
+)
+
+
+class Requests:
+    """Start requests that hold their slot until released."""
+
+    def __init__(self, scheduler: RequestScheduler) -> None:
+        """Initialize the requests."""
+        self.scheduler = scheduler
+        self.started: list[str] = []
+        self._releases: dict[str, asyncio.Event] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    async def _async_request(self, name: str, priority: int) -> None:
+        async with self.scheduler.slot(priority):
+            self.started.append(name)
+            await self._releases[name].wait()
+
+    async def async_start(self, name: str, priority: int) -> None:
+        """Start a request and let it run until it holds a slot or queues."""
+        self._releases[name] = asyncio.Event()
+        self.tasks[name] = asyncio.get_running_loop().create_task(
+            self._async_request(name, priority)
+        )
+        await asyncio.sleep(0)
+
+    async def async_finish(self, name: str) -> None:
+        """Finish a request and let the requests it woke start."""
+        self._releases[name].set()
+        await self.tasks[name]
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+def test_queued_requests_start_in_priority_order() -> None:
+    """Test a freed slot goes to the highest priority, then the oldest request."""
+
+    async def _async_test() -> list[str]:
+        requests = Requests(RequestScheduler(limit=1))
+        await requests.async_start("running", PRIORITY_BULK)
+        await requests.async_start("bulk", PRIORITY_BULK)
+        await requests.async_start("targeted", PRIORITY_TARGETED)
+        await requests.async_start("interactive", PRIORITY_INTERACTIVE)
+
+        for name in ("running", "interactive", "targeted", "bulk"):
+            await requests.async_finish(name)
+        return requests.started
+
+    assert asyncio.run(_async_test()) == ["running", "interactive", "targeted", "bulk"]
+
+
+def test_interactive_requests_use_reserved_slots() -> None:
+    """Test interactive requests start on reserved slots while polling queues."""
+
+    async def _async_test() -> None:
+        scheduler = RequestScheduler(limit=2, reserved=2)
+        requests = Requests(scheduler)
+        for name in ("bulk1", "bulk2", "bulk3"):
+            await requests.async_start(name, PRIORITY_BULK)
+        await requests.async_start("targeted", PRIORITY_TARGETED)
+        await requests.async_start("command1", PRIORITY_INTERACTIVE)
+        await requests.async_start("command2", PRIORITY_INTERACTIVE)
+        await requests.async_start("command3", PRIORITY_INTERACTIVE)
+
+        assert requests.started == ["bulk1", "bulk2", "command1", "command2"]
+        assert scheduler._active == 4
+
+        # A freed reserved slot goes to the queued command, never to polling
+        await requests.async_finish("command1")
+        assert requests.started[-1] == "command3"
+        await requests.async_finish("command2")
+        await requests.async_finish("command3")
+        assert requests.started == ["bulk1", "bulk2", "command1", "command2", "command3"]
+
+        for name in ("bulk1", "bulk2", "targeted", "bulk3"):
+            await requests.async_finish(name)
+        assert scheduler._active == 0
+
+    asyncio.run(_async_test())
+
+
+def test_requests_do_not_overtake_queued_requests() -> None:
+    """Test a new request queues behind waiting requests of the same or higher priority."""
+
+    async def _async_test() -> None:
+        scheduler = RequestScheduler(limit=1)
+        requests = Requests(scheduler)
+        await requests.async_start("running", PRIORITY_TARGETED)
+        await requests.async_start("targeted1", PRIORITY_TARGETED)
+        await requests.async_start("bulk1", PRIORITY_BULK)
+        await requests.async_start("targeted2", PRIORITY_TARGETED)
+        await requests.async_start("bulk2", PRIORITY_BULK)
+        assert requests.started == ["running"]
+
+        for name in ("running", "targeted1", "targeted2", "bulk1", "bulk2"):
+            await requests.async_finish(name)
+        assert requests.started == ["running", "targeted1", "targeted2", "bulk1", "bulk2"]
+        assert scheduler._active == 0
+
+    asyncio.run(_async_test())
+
+
+def test_cancelled_waiter_returns_a_handed_over_slot() -> None:
+    """Test cancelling a request right after it was handed a slot frees the slot."""
+
+    async def _async_test() -> None:
+        scheduler = RequestScheduler(limit=1)
+        requests = Requests(scheduler)
+        running = scheduler.slot(PRIORITY_BULK)
+        await running.__aenter__()
+        await requests.async_start("cancelled", PRIORITY_BULK)
+        await requests.async_start("next", PRIORITY_BULK)
+
+        # Free the slot, which hands it over, and cancel its new owner
+        # before it gets to run
+        await running.__aexit__(None, None, None)
+        assert scheduler._active == 1
+        requests.tasks["cancelled"].cancel()
+        await asyncio.gather(requests.tasks["cancelled"], return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert requests.started == ["next"]
+        await requests.async_finish("next")
+        assert scheduler._active == 0
+
+    asyncio.run(_async_test())
+
+
+def test_cancelled_waiter_leaves_the_queue() -> None:
+    """Test cancelling a queued request does not take or leak a slot."""
+
+    async def _async_test() -> None:
+        scheduler = RequestScheduler(limit=1)
+        requests = Requests(scheduler)
+        await requests.async_start("running", PRIORITY_BULK)
+        await requests.async_start("cancelled", PRIORITY_BULK)
+
+        requests.tasks["cancelled"].cancel()
+        await asyncio.gather(requests.tasks["cancelled"], return_exceptions=True)
+        await requests.async_finish("running")
+
+        assert requests.started == ["running"]
+        assert scheduler._active == 0
+
+    asyncio.run(_async_test())